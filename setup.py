@@ -31,8 +31,8 @@ setup(
     author_email="vfdev.5@gmail.com",
     url="https://github.com/vfdev-5/ImageTilingUtils",
     packages=find_packages(exclude=["tests", "examples"]),
-    install_requires=["six",],
+    install_requires=[],
     license="MIT",
     test_suite="tests",
-    extras_require={"tests": ["pytest", "pytest-cov"]},
+    extras_require={"numpy": ["numpy"], "tests": ["pytest", "pytest-cov", "numpy"]},
 )
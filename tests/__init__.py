@@ -0,0 +1,40 @@
+import numpy as np
+
+
+class CoreExtentsMixin(object):
+    """Checks of core regions shared by tests of tiles"""
+
+    def _test_core_extents(self, tiles):
+        debug_msg = "tiles={}\n".format(tiles.__dict__)
+        core_extents = tiles.get_core_extents()
+        self.assertEqual(len(core_extents), len(tiles), debug_msg)
+        width, height = tiles.image_size
+        out_width, out_height = int(round(width * tiles.scale)), int(round(height * tiles.scale))
+        covered = np.zeros((height, width), dtype=np.int32)
+        out_covered = np.zeros((out_height, out_width), dtype=np.int32)
+        for idx in range(len(tiles)):
+            extent, out_size = tiles[idx]
+            core, tile_core = tiles.get_core_extent(idx)
+            self.assertEqual((core, tile_core), core_extents[idx], debug_msg)
+            # Core is inside the tile
+            x, y, w, h = core
+            self.assertGreaterEqual(x, extent[0], debug_msg)
+            self.assertGreaterEqual(y, extent[1], debug_msg)
+            self.assertLessEqual(x + w, extent[0] + extent[2], debug_msg)
+            self.assertLessEqual(y + h, extent[1] + extent[3], debug_msg)
+            # Core in tile coordinates is inside the tile output
+            self.assertGreaterEqual(min(tile_core), 0, debug_msg)
+            self.assertLessEqual(tile_core[0] + tile_core[2], out_size[0], debug_msg)
+            self.assertLessEqual(tile_core[1] + tile_core[3], out_size[1], debug_msg)
+            if tiles.scale == 1.0:
+                self.assertEqual((tile_core[0], tile_core[1]), (x - extent[0], y - extent[1]), debug_msg)
+                self.assertEqual((tile_core[2], tile_core[3]), (w, h), debug_msg)
+            covered[y:y + h, x:x + w] += 1
+            # Tile output is placed at the scaled tile offset in the scaled image
+            out_x = int(round(extent[0] * tiles.scale)) + tile_core[0]
+            out_y = int(round(extent[1] * tiles.scale)) + tile_core[1]
+            out_covered[out_y:out_y + tile_core[3], out_x:out_x + tile_core[2]] += 1
+
+        # Core regions make a partition of the image, and their tile outputs a partition of the scaled image
+        self.assertTrue((covered == 1).all(), debug_msg)
+        self.assertTrue((out_covered == 1).all(), debug_msg)
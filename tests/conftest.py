@@ -0,0 +1,10 @@
+import sys
+
+
+collect_ignore = []
+if sys.version_info < (3, 7):
+    # asyncio front-end requires Python 3.7+
+    collect_ignore.append("test_aio.py")
+if sys.version_info[0] < 3:
+    # Thread and process pools and the deduplication cache use Python 3 standard library
+    collect_ignore.extend(["test_loader.py", "test_pipeline.py", "test_dedup.py"])
@@ -0,0 +1,112 @@
+import asyncio
+import unittest
+
+from tiling import ConstStrideTiles
+from tiling.aio import AsyncSharedReader
+
+from tests.test_reader import _CountingReader
+
+
+class TestAsyncSharedReader(unittest.TestCase):
+    def test_single_flight(self):
+        tiles = ConstStrideTiles((100, 120), (32, 32), stride=(20, 20))
+        calls = []
+
+        async def read_fn(extent, out_size):
+            calls.append(extent)
+            await asyncio.sleep(0.001)
+            return [extent]
+
+        reader = AsyncSharedReader(read_fn)
+
+        async def _consumer():
+            res = []
+            for extent, out_size in tiles:
+                async with reader.read(extent, out_size) as data:
+                    res.append(data)
+                    await asyncio.sleep(0.001)
+            return res
+
+        async def _main():
+            return await asyncio.gather(*[_consumer() for _ in range(4)])
+
+        results = asyncio.run(_main())
+        self.assertEqual(len(calls), len(tiles))
+        self.assertEqual(reader.n_shared, 3 * len(tiles))
+        self.assertEqual(len(reader), 0)
+        for i in range(1, 4):
+            for a, b in zip(results[0], results[i]):
+                self.assertIs(a, b)
+
+    def test_sync_read_fn_and_error(self):
+        read_fn = _CountingReader(delay=0.01)
+        reader = AsyncSharedReader(read_fn)
+
+        async def _main():
+            extent, out_size = (0, 0, 10, 10), (10, 10)
+            res = await asyncio.gather(*[reader.acquire(extent, out_size) for _ in range(3)])
+            for _ in range(3):
+                reader.release(extent, out_size)
+            return res
+
+        res = asyncio.run(_main())
+        self.assertEqual(len(read_fn.calls), 1)
+        self.assertIs(res[0], res[2])
+        self.assertEqual(len(reader), 0)
+
+        async def failing_read_fn(extent, out_size):
+            await asyncio.sleep(0.001)
+            raise IOError("Failed to read")
+
+        reader = AsyncSharedReader(failing_read_fn)
+
+        async def _failing():
+            return await asyncio.gather(
+                *[reader.acquire((0, 0, 1, 1), (1, 1)) for _ in range(3)], return_exceptions=True
+            )
+
+        res = asyncio.run(_failing())
+        self.assertTrue(all(isinstance(r, IOError) for r in res))
+        self.assertEqual(len(reader), 0)
+
+    def test_cancelled_consumer(self):
+        calls = []
+
+        async def read_fn(extent, out_size):
+            calls.append(extent)
+            await asyncio.sleep(0.05)
+            return [extent]
+
+        reader = AsyncSharedReader(read_fn)
+        extent, out_size = (0, 0, 10, 10), (10, 10)
+
+        async def _main():
+            owner = asyncio.ensure_future(reader.acquire(extent, out_size))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(reader.acquire(extent, out_size))
+            await asyncio.sleep(0.01)
+            owner.cancel()
+            data = await waiter
+            self.assertTrue(owner.cancelled())
+            self.assertFalse(waiter.cancelled())
+            self.assertEqual(data, [extent])
+            self.assertEqual(len(reader), 1)
+            reader.release(extent, out_size)
+            self.assertEqual(len(reader), 0)
+
+            # The read is cancelled when all consumers are cancelled
+            consumers = [asyncio.ensure_future(reader.acquire(extent, out_size)) for _ in range(2)]
+            await asyncio.sleep(0.01)
+            for consumer in consumers:
+                consumer.cancel()
+            await asyncio.gather(*consumers, return_exceptions=True)
+            self.assertEqual(len(reader), 0)
+            self.assertEqual(await reader.acquire(extent, out_size), [extent])
+            reader.release(extent, out_size)
+
+        asyncio.run(_main())
+        self.assertEqual(len(calls), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,10 @@ import unittest
 
 from tiling import ConstSizeTiles
 
+from tests import CoreExtentsMixin
 
-class TestConstSizeTiles(unittest.TestCase):
+
+class TestConstSizeTiles(CoreExtentsMixin, unittest.TestCase):
     def test_wrong_args(self):
 
         assertRaisesRegex = self.assertRaisesRegex if hasattr(self, "assertRaisesRegex") else self.assertRaisesRegexp
@@ -101,6 +103,13 @@ class TestConstSizeTiles(unittest.TestCase):
                     for min_overlapping in range(int(ts / scale) // 2, int(ts / scale) - 1, 5):
                         _test(im_size, ts, scale, min_overlapping)
 
+    def test_core_extents(self):
+        for scale in [0.7, 1.0, 1.78]:
+            for im_size in [67, 71]:
+                for min_overlapping in [0, 5, 11]:
+                    tiles = ConstSizeTiles((im_size, im_size + 3), 32, min_overlapping=min_overlapping, scale=scale)
+                    self._test_core_extents(tiles)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,8 +5,10 @@ import math
 
 from tiling import ConstStrideTiles, ceil_int
 
+from tests import CoreExtentsMixin
 
-class TestConstStrideTiles(unittest.TestCase):
+
+class TestConstStrideTiles(CoreExtentsMixin, unittest.TestCase):
     def test_get_version(self):
         from tiling import __version__
 
@@ -233,6 +235,63 @@ class TestConstStrideTiles(unittest.TestCase):
                         for origin in range(-5, 5):
                             _test(im_size, ext, scale, stride, origin)
 
+    def test_extend(self):
+        def _test(ts, stride, origin, include_nodata):
+            debug_msg = "ts={} stride={} origin={} include_nodata={}\n".format(ts, stride, origin, include_nodata)
+            final_height = 237
+            ref_tiles = ConstStrideTiles(
+                (100, final_height), ts, stride=stride, origin=(origin, origin), include_nodata=include_nodata
+            )
+            tiles = ConstStrideTiles(
+                (100, ts + 1), ts, stride=stride, origin=(origin, origin), include_nodata=include_nodata
+            )
+
+            emitted = []
+            for height in range(ts + 1, final_height + 1, 7):
+                new_tiles = tiles.extend(height)
+                for idx, (extent, out_size) in new_tiles:
+                    # Completed tiles are inside the current image
+                    self.assertLessEqual(extent[1] + extent[3], height, debug_msg)
+                    # Completed tiles do not change with further growth
+                    self.assertEqual((extent, out_size), ref_tiles[idx], debug_msg)
+                emitted.extend(idx for idx, _ in new_tiles)
+                self.assertEqual(len(tiles), tiles.nx * tiles.ny, debug_msg)
+
+            emitted.extend(idx for idx, _ in tiles.extend(final_height, final=True))
+            self.assertEqual(emitted, list(range(len(ref_tiles))), debug_msg)
+            for i in range(len(ref_tiles)):
+                self.assertEqual(tiles[i], ref_tiles[i], debug_msg)
+
+        for ts in [10, 32]:
+            for stride in [5, 10, 17, 40]:
+                for origin in [-7, 0, 3]:
+                    for include_nodata in [True, False]:
+                        _test(ts, stride, origin, include_nodata)
+
+    def test_extend_wrong_args(self):
+        tiles = ConstStrideTiles((100, 50), (10, 10), stride=(5, 5))
+        self.assertEqual(tiles.extend(50), [(i, tiles[i]) for i in range(len(tiles))])
+        self.assertEqual(tiles.extend(52), [])
+
+        with self.assertRaises(ValueError):
+            tiles.extend(20)
+
+        tiles.extend(60, final=True)
+        with self.assertRaises(RuntimeError):
+            tiles.extend(70)
+
+    def test_core_extents(self):
+        for scale in [0.7, 1.0, 1.78]:
+            for stride in [10, 17, 32]:
+                # Pixels before a positive origin are not covered by tiles
+                for origin in [-7, 0]:
+                    for include_nodata in [True, False]:
+                        tiles = ConstStrideTiles(
+                            (67, 71), 32, stride=stride, scale=scale, origin=(origin, origin),
+                            include_nodata=include_nodata,
+                        )
+                        self._test_core_extents(tiles)
+
     def test_int_ceil(self):
         self.assertEqual(2, ceil_int(1.789))
 
@@ -0,0 +1,128 @@
+import pickle
+import unittest
+
+from tiling import ConstStrideTiles, ConstSizeTiles, RoiTiles
+from tiling.dataset import TilesDataset, IterableTilesDataset, to_torch_dataset
+
+try:
+    import torch
+
+    has_torch = True
+except ImportError:
+    has_torch = False
+
+
+class _OpenReader(object):
+    """Picklable reader factory counting opened readers"""
+
+    n_opened = 0
+
+    def __call__(self):
+        _OpenReader.n_opened += 1
+        return _read_fn
+
+
+def _read_fn(extent, out_size):
+    return extent, out_size
+
+
+class TestTilesDataset(unittest.TestCase):
+    all_tiles = [
+        ConstStrideTiles((100, 120), (32, 32), stride=(20, 20), origin=(-7, -7), include_nodata=False),
+        ConstSizeTiles((100, 120), (32, 32), min_overlapping=7, scale=1.78),
+    ]
+
+    def test_wrong_args(self):
+        tiles = self.all_tiles[0]
+        with self.assertRaises(TypeError):
+            TilesDataset(None, _OpenReader())
+        with self.assertRaises(TypeError):
+            TilesDataset(tiles, None)
+        with self.assertRaises(TypeError):
+            TilesDataset(tiles, _OpenReader(), transform=1)
+        with self.assertRaises(ValueError):
+            IterableTilesDataset(tiles, _OpenReader(), batch_size=0)
+        with self.assertRaises(IndexError):
+            TilesDataset(tiles, _OpenReader()).__getitems__([0, len(tiles)])
+        with self.assertRaises(TypeError):
+            to_torch_dataset(tiles)
+
+    def test_map_style(self):
+        for tiles in self.all_tiles:
+            dataset = TilesDataset(tiles, _OpenReader(), transform=lambda sample: sample[0])
+            self.assertEqual(len(dataset), len(tiles))
+            indices = list(range(len(tiles))) + [-1, -2]
+            self.assertEqual(dataset.__getitems__(indices), [tiles[i][0] for i in indices])
+            self.assertEqual(dataset.get_tiles(indices), [tiles[i] for i in indices])
+            for i in indices:
+                self.assertEqual(dataset[i], tiles[i][0])
+
+    def test_roi_tiles(self):
+        for tiles in self.all_tiles:
+            roi_tiles = RoiTiles(tiles, [(10, 20, 30, 40), (80, 0, 10, 10)])
+            dataset = TilesDataset(roi_tiles, _OpenReader(), transform=lambda sample: sample[0])
+            self.assertEqual(len(dataset), len(roi_tiles))
+            indices = list(range(len(roi_tiles))) + [-1]
+            self.assertEqual(dataset.get_tiles(indices), [roi_tiles[i] for i in indices])
+            with self.assertRaises(IndexError):
+                dataset.get_tiles([len(roi_tiles)])
+
+    def test_growing_tiles(self):
+        tiles = ConstStrideTiles((100, 50), (32, 32), stride=(20, 20), include_nodata=False)
+        dataset = TilesDataset(tiles, _OpenReader())
+        self.assertEqual(dataset.get_tiles(range(len(tiles))), list(tiles))
+        tiles.extend(130)
+        self.assertEqual(dataset.get_tiles(range(len(tiles))), [tiles[i] for i in range(len(tiles))])
+
+    def test_lazy_reader_per_process(self):
+        dataset = TilesDataset(self.all_tiles[0], _OpenReader())
+        n_opened = _OpenReader.n_opened
+        dataset[0]
+        dataset[1]
+        self.assertEqual(_OpenReader.n_opened, n_opened + 1)
+
+        # Reader is not pickled and is opened again in a new process
+        dataset2 = pickle.loads(pickle.dumps(dataset))
+        self.assertIsNone(dataset2._reader)
+        dataset2[0]
+        self.assertEqual(_OpenReader.n_opened, n_opened + 2)
+
+        # Forked process
+        dataset._pid = -1
+        dataset[0]
+        self.assertEqual(_OpenReader.n_opened, n_opened + 3)
+
+    def test_iterable_sharding(self):
+        for tiles in self.all_tiles:
+            for num_workers in [1, 2, 3, 7]:
+                samples = []
+                for worker_id in range(num_workers):
+                    dataset = IterableTilesDataset(
+                        tiles, _OpenReader(), get_worker_info=lambda: (worker_id, num_workers), batch_size=5
+                    )
+                    worker_samples = list(dataset)
+                    self.assertLessEqual(len(worker_samples), len(tiles) // num_workers + 1)
+                    samples += worker_samples
+                self.assertEqual(samples, [tiles[i] for i in range(len(tiles))])
+
+    def test_default_worker_info(self):
+        dataset = IterableTilesDataset(self.all_tiles[0], _OpenReader())
+        self.assertEqual(list(dataset), [tiles for tiles in self.all_tiles[0]])
+
+    @unittest.skipIf(not has_torch, "torch is not installed")
+    def test_torch(self):
+        from torch.utils.data import DataLoader
+
+        tiles = self.all_tiles[0]
+        dataset = to_torch_dataset(TilesDataset(tiles, _OpenReader(), transform=lambda s: torch.tensor(s[0])))
+        self.assertTrue(isinstance(dataset, torch.utils.data.Dataset))
+        batches = list(DataLoader(dataset, batch_size=4))
+        self.assertEqual(sum(len(b) for b in batches), len(tiles))
+
+        dataset = to_torch_dataset(IterableTilesDataset(tiles, _OpenReader(), transform=lambda s: torch.tensor(s[0])))
+        self.assertTrue(isinstance(dataset, torch.utils.data.IterableDataset))
+        self.assertEqual(len(list(DataLoader(dataset, batch_size=None))), len(tiles))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from tiling import ConstStrideTiles
+from tiling.dedup import Deduplicator, get_content_key
+
+
+def _read_fn(extent, out_size):
+    # Tiles on the left half are constant, on the right half are random
+    x, y, w, h = extent
+    if x < 50:
+        return np.full((h, w), 7, dtype=np.uint8)
+    return np.random.RandomState(x + 1000 * y).randint(0, 255, size=(h, w)).astype(np.uint8)
+
+
+class TestDedup(unittest.TestCase):
+    def test_get_content_key(self):
+        a = np.arange(20, dtype=np.int32).reshape(4, 5)
+        self.assertEqual(get_content_key(a), get_content_key(a.copy()))
+        self.assertEqual(get_content_key(a[:, 1:3]), get_content_key(a[:, 1:3].copy()))
+        self.assertNotEqual(get_content_key(a), get_content_key(a.reshape(5, 4)))
+        self.assertNotEqual(get_content_key(a), get_content_key(a.astype(np.int64)))
+        b = a.copy()
+        b[2, 3] = 0
+        self.assertNotEqual(get_content_key(a), get_content_key(b))
+
+        c = np.zeros((4, 5), dtype=np.float32)
+        self.assertEqual(get_content_key(c)[0], "const")
+        self.assertNotEqual(get_content_key(c), get_content_key(c + 1))
+        c[0, 1] = 1
+        self.assertEqual(get_content_key(c)[0], "data")
+        self.assertEqual(get_content_key(np.zeros((0, 3)))[0], "data")
+
+        self.assertEqual(get_content_key(b"abc"), get_content_key(bytearray(b"abc")))
+        self.assertNotEqual(get_content_key(b"abc"), get_content_key(b"abd"))
+
+    def test_wrong_args(self):
+        with self.assertRaises(TypeError):
+            Deduplicator(None)
+        with self.assertRaises(TypeError):
+            Deduplicator(np.sum, key_fn=1)
+        with self.assertRaises(ValueError):
+            Deduplicator(np.sum, max_size=0)
+
+    def test_deduplicator(self):
+        calls = []
+
+        def fn(data):
+            calls.append(data)
+            return data.sum()
+
+        dedup = Deduplicator(fn, max_size=2)
+        a = np.zeros((3, 3))
+        b = np.arange(9).reshape(3, 3)
+        c = np.ones((3, 3))
+        self.assertEqual([dedup(x) for x in (a, b, a.copy(), b.copy(), c, a)], [0, 36, 0, 36, 9, 0])
+        # a is evicted after c, as b is the most recently used
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(len(dedup), 2)
+        self.assertEqual(dedup.stats, {"n_hits": 2, "n_misses": 4, "size": 2, "hit_rate": 2 / 6})
+
+        # Cache is not pickled
+        dedup2 = pickle.loads(pickle.dumps(Deduplicator(np.sum)))
+        self.assertEqual(dedup2(b), 36)
+
+        dedup.clear()
+        self.assertEqual(len(dedup), 0)
+        self.assertEqual(dedup.stats["n_misses"], 0)
+
+    def test_pipeline(self):
+        tiles = ConstStrideTiles((100, 100), (10, 10), stride=(10, 10))
+        expected = [float(_read_fn(*t).mean()) for t in tiles]
+
+        calls = []
+
+        def predict(data):
+            calls.append(data)
+            return float(data.mean())
+
+        dedup = Deduplicator(predict)
+        self.assertEqual(list(tiles.pipe().read(_read_fn, n_workers=2).dedup(dedup)), expected)
+        # Constant tiles are computed once
+        self.assertEqual(len(calls), len(tiles) // 2 + 1)
+        self.assertEqual(dedup.n_hits, len(tiles) // 2 - 1)
+
+        self.assertEqual(list(tiles.pipe().read(_read_fn).dedup(predict, max_size=4)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+
+from tiling import ConstStrideTiles, ConstSizeTiles, Extent, Extents
+
+
+class TestExtents(unittest.TestCase):
+    def test_container(self):
+        extents = Extents(3)
+        self.assertEqual(len(extents), 3)
+        self.assertEqual(extents.nbytes, 3 * 16)
+        self.assertEqual(extents[0], (0, 0, 0, 0))
+
+        extents[1] = (1, 2, 3, 4)
+        extents[-1] = Extent(-5, -6, 7, 8)
+        self.assertEqual(extents[1], Extent(x=1, y=2, width=3, height=4))
+        self.assertEqual(extents[2].x, -5)
+        self.assertEqual(list(extents), [(0, 0, 0, 0), (1, 2, 3, 4), (-5, -6, 7, 8)])
+        self.assertEqual(extents, Extents.from_iterable([(0, 0, 0, 0), (1, 2, 3, 4), (-5, -6, 7, 8)]))
+
+        view = extents.view(1)
+        self.assertEqual(view.tolist(), [1, 2, 3, 4])
+        view[0] = 10
+        self.assertEqual(extents[1], (10, 2, 3, 4))
+
+        with self.assertRaises(IndexError):
+            extents[3]
+
+        with self.assertRaises(ValueError):
+            Extents(-1)
+
+        with self.assertRaises(ValueError):
+            Extents.from_iterable([(1, 2, 3)])
+
+        with self.assertRaises(AttributeError):
+            extents[0].z = 1
+
+    def test_from_tiles(self):
+        all_tiles = [
+            ConstStrideTiles((100, 120), (32, 32), stride=(20, 20), origin=(-7, -7), include_nodata=True),
+            ConstStrideTiles((100, 120), (32, 32), stride=(20, 20), origin=(-7, -7), include_nodata=False),
+            ConstStrideTiles((100, 120), (10, 10), stride=(20, 20), scale=0.7, include_nodata=False),
+            ConstSizeTiles((100, 120), (32, 32), min_overlapping=7),
+            ConstSizeTiles((100, 120), (32, 32), min_overlapping=7, scale=1.78),
+        ]
+        for tiles in all_tiles:
+            extents = tiles.get_extents()
+            self.assertEqual(len(extents), len(tiles))
+            self.assertEqual(list(extents), [extent for extent, _ in tiles])
+            for idx in range(len(tiles)):
+                self.assertEqual(extents[idx], tiles[idx][0])
+                self.assertEqual(tiles.get_extent(idx), tiles[idx][0])
+
+            # Reuse preallocated containers
+            out = Extents(len(tiles))
+            self.assertIs(tiles.get_extents(out=out), out)
+            self.assertEqual(out, extents)
+            view = out.view(0)
+            self.assertIs(tiles.get_extent(-1, out=view), view)
+            self.assertEqual(out[0], tiles[-1][0])
+
+            with self.assertRaises(ValueError):
+                tiles.get_extents(out=Extents(len(tiles) + 1))
+            with self.assertRaises(IndexError):
+                tiles.get_extent(len(tiles))
+
+            # Tiles are made of tiles along axes
+            x_tiles = tiles.get_axis_tiles(0)
+            y_tiles = tiles.get_axis_tiles(1)
+            self.assertEqual((len(x_tiles), len(y_tiles)), (tiles.nx, tiles.ny))
+            for idx, (extent, out_size) in enumerate(tiles):
+                x, w, ow = x_tiles[idx % tiles.nx]
+                y, h, oh = y_tiles[idx // tiles.nx]
+                self.assertEqual(((x, y, w, h), (ow, oh)), (extent, out_size))
+            self.assertEqual(tiles.get_axis_tiles(1, [tiles.ny - 1]), y_tiles[-1:])
+            with self.assertRaises(ValueError):
+                tiles.get_axis_tiles(2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+import timeit
+import unittest
+
+
+_IMPORT_SCRIPT = """
+import sys
+
+import tiling
+
+tiles = tiling.ConstSizeTiles((500, 500), (256, 256))
+print(",".join(sorted(sys.modules.keys())))
+"""
+
+
+def _run_import():
+    output = subprocess.check_output([sys.executable, "-c", _IMPORT_SCRIPT])
+    return set(output.decode("utf-8").strip().split(","))
+
+
+def _run_time(code):
+    start = timeit.default_timer()
+    subprocess.check_call([sys.executable, "-c", code])
+    return timeit.default_timer() - start
+
+
+class TestImport(unittest.TestCase):
+    def test_no_third_party_dependencies(self):
+        modules = _run_import()
+        optional_modules = [
+            "tiling.writer",
+            "tiling.planner",
+            "tiling.reader",
+            "tiling.aio",
+            "tiling.loader",
+            "tiling.dataset",
+            "tiling.pipeline",
+            "tiling.dedup",
+        ]
+        for name in ["six", "numpy", "asyncio"] + optional_modules:
+            self.assertNotIn(name, modules)
+
+    def test_import_time(self):
+        # Import time is compared to the start of a bare interpreter in the same conditions, such that it does not
+        # depend on the machine load. Importing tiling takes about twice the interpreter start, numpy several times.
+        bare, imported = [], []
+        for _ in range(5):
+            bare.append(_run_time("pass"))
+            imported.append(_run_time("import tiling"))
+        self.assertLess(min(imported), 4.0 * min(bare))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import threading
+import time
+import unittest
+
+from tiling import ConstStrideTiles, RoiTiles
+from tiling.loader import AdaptiveTileLoader
+
+
+class _Data(object):
+    def __init__(self, extent, nbytes):
+        self.extent = extent
+        self.nbytes = nbytes
+
+
+class _ConcurrencyCounter(object):
+    def __init__(self, latency_fn, nbytes=None):
+        self.latency_fn = latency_fn
+        self.nbytes = nbytes
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, extent, out_size):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            n = self.running
+        time.sleep(self.latency_fn(n))
+        with self.lock:
+            self.running -= 1
+        return _Data(extent, self.nbytes) if self.nbytes is not None else extent
+
+
+class TestAdaptiveTileLoader(unittest.TestCase):
+    def test_wrong_args(self):
+        tiles = ConstStrideTiles((100, 120), (10, 10), stride=(5, 5))
+        with self.assertRaises(TypeError):
+            AdaptiveTileLoader(None, lambda e, o: e)
+        with self.assertRaises(TypeError):
+            AdaptiveTileLoader(tiles, None)
+        with self.assertRaises(ValueError):
+            AdaptiveTileLoader(tiles, lambda e, o: e, min_workers=4, max_workers=2)
+        with self.assertRaises(ValueError):
+            AdaptiveTileLoader(tiles, lambda e, o: e, memory_budget=0)
+
+    def test_order_and_increase(self):
+        tiles = ConstStrideTiles((320, 320), (32, 32), stride=(16, 16))
+        read_fn = _ConcurrencyCounter(lambda n: 0.003)
+        loader = AdaptiveTileLoader(tiles, read_fn, max_workers=8)
+        n = 0
+        for i, (extent, out_size, data) in enumerate(loader):
+            self.assertEqual((extent, out_size), tiles[i])
+            self.assertEqual(data, extent)
+            n += 1
+        self.assertEqual(n, len(tiles))
+        # Latency does not depend on concurrency: the consumer starves and concurrency increases
+        self.assertGreater(loader.settings["n_in_flight"], loader.min_workers)
+        self.assertEqual(loader.settings["prefetch_depth"], 2 * loader.settings["n_in_flight"])
+        self.assertLessEqual(read_fn.max_running, 8)
+
+    def test_roi_tiles(self):
+        tiles = RoiTiles(ConstStrideTiles((320, 320), (32, 32), stride=(16, 16)), [(50, 60, 100, 40), (250, 250, 5, 5)])
+        loader = AdaptiveTileLoader(tiles, lambda extent, out_size: extent, max_workers=4)
+        res = list(loader)
+        self.assertEqual([(extent, out_size) for extent, out_size, _ in res], list(tiles))
+        self.assertEqual([data for _, _, data in res], [extent for extent, _ in tiles])
+
+    def test_decrease_on_congestion(self):
+        tiles = ConstStrideTiles((320, 320), (32, 32), stride=(16, 16))
+        # Latency grows linearly with concurrency: more in-flight reads do not improve throughput
+        read_fn = _ConcurrencyCounter(lambda n: 0.001 * n)
+        loader = AdaptiveTileLoader(tiles, read_fn, max_workers=16)
+        self.assertEqual(len(list(loader)), len(tiles))
+        self.assertLess(loader.settings["n_in_flight"], 8)
+
+    def test_memory_budget(self):
+        tiles = ConstStrideTiles((320, 320), (32, 32), stride=(16, 16))
+        read_fn = _ConcurrencyCounter(lambda n: 0.002, nbytes=1000)
+        loader = AdaptiveTileLoader(tiles, read_fn, max_workers=16, memory_budget=3000)
+        for extent, _, data in loader:
+            self.assertEqual(data.extent, extent)
+        self.assertEqual(loader.settings["tile_nbytes"], 1000)
+        self.assertLessEqual(loader.settings["prefetch_depth"], 3)
+        self.assertLessEqual(loader.settings["n_in_flight"], 3)
+        self.assertLessEqual(read_fn.max_running, 3 + 1)
+
+    def test_early_stop_and_error(self):
+        tiles = ConstStrideTiles((320, 320), (32, 32), stride=(16, 16))
+        loader = AdaptiveTileLoader(tiles, _ConcurrencyCounter(lambda n: 0.001), max_workers=4)
+        for i, _ in enumerate(loader):
+            if i == 10:
+                break
+
+        def read_fn(extent, out_size):
+            if extent[0] > 100:
+                raise IOError("Failed to read")
+            return extent
+
+        with self.assertRaises(IOError):
+            list(AdaptiveTileLoader(tiles, read_fn))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from tiling import ConstStrideTiles, RoiTiles
+from tiling.pipeline import Pipeline
+
+
+def _read_fn(extent, out_size):
+    return extent[0] + extent[1]
+
+
+def _is_even(x):
+    return x % 2 == 0
+
+
+def _square(x):
+    return x * x
+
+
+class TestPipeline(unittest.TestCase):
+    tiles = ConstStrideTiles((100, 120), (10, 10), stride=(5, 5))
+
+    def _expected(self, batch_size=None):
+        res = [_square(_read_fn(*t)) for t in self.tiles if _is_even(_read_fn(*t))]
+        if batch_size is None:
+            return res
+        return [res[i:i + batch_size] for i in range(0, len(res), batch_size)]
+
+    def test_wrong_args(self):
+        pipeline = self.tiles.pipe()
+        with self.assertRaises(TypeError):
+            pipeline.map(None)
+        with self.assertRaises(TypeError):
+            pipeline.filter(1)
+        with self.assertRaises(ValueError):
+            pipeline.read(_read_fn, n_workers=0)
+        with self.assertRaises(ValueError):
+            pipeline.read(_read_fn, n_workers=2, executor="abc")
+        with self.assertRaises(ValueError):
+            pipeline.read(_read_fn, n_workers=2, buffer_size=0)
+        with self.assertRaises(ValueError):
+            pipeline.batch(0)
+
+    def test_lazy_and_serial(self):
+        calls = []
+
+        def read_fn(extent, out_size):
+            calls.append(extent)
+            return _read_fn(extent, out_size)
+
+        pipeline = self.tiles.pipe().read(read_fn).filter(_is_even).map(_square)
+        self.assertTrue(isinstance(pipeline, Pipeline))
+        self.assertEqual(len(calls), 0)
+        self.assertEqual(list(pipeline), self._expected())
+        self.assertEqual(len(calls), len(self.tiles))
+        # Stages are fused into a single segment
+        self.assertEqual(len(pipeline._get_segments()), 1)
+
+        # Pipelines are immutable
+        self.assertEqual(list(self.tiles.pipe()), [t for t in self.tiles])
+
+    def test_streaming(self):
+        # Only few items are read ahead of the consumer
+        calls = []
+
+        def read_fn(extent, out_size):
+            calls.append(extent)
+            return _read_fn(extent, out_size)
+
+        it = iter(self.tiles.pipe().read(read_fn, n_workers=2, buffer_size=3).batch(2))
+        next(it)
+        self.assertLessEqual(len(calls), 2 + 3 + 1)
+        it.close()
+
+    def test_batch(self):
+        pipeline = self.tiles.pipe().read(_read_fn).filter(_is_even).map(_square)
+        self.assertEqual(list(pipeline.batch(7)), self._expected(7))
+        n = len(self._expected())
+        batches = list(pipeline.batch(7, drop_last=True))
+        self.assertEqual(len(batches), n // 7)
+        self.assertTrue(all(len(b) == 7 for b in batches))
+        # Stages after a batch
+        self.assertEqual(list(pipeline.batch(7).map(len)), [len(b) for b in self._expected(7)])
+
+    def test_threads(self):
+        threads = set()
+
+        def read_fn(extent, out_size):
+            threads.add(threading.current_thread().name)
+            return _read_fn(extent, out_size)
+
+        pipeline = self.tiles.pipe().read(read_fn, n_workers=4).filter(_is_even).map(_square, n_workers=2).batch(5)
+        self.assertEqual(list(pipeline), self._expected(5))
+        self.assertNotIn(threading.current_thread().name, threads)
+        self.assertEqual(len(pipeline._get_segments()), 3)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            pipeline = self.tiles.pipe().read(_read_fn, n_workers=3, executor=executor).filter(_is_even).map(_square)
+            self.assertEqual(list(pipeline), self._expected())
+
+    def test_early_break(self):
+        calls = []
+
+        def read_fn(extent, out_size):
+            calls.append(extent)
+            time.sleep(0.01)
+            return _read_fn(extent, out_size)
+
+        for pipeline in [
+            self.tiles.pipe().read(read_fn, n_workers=1, buffer_size=20),
+            self.tiles.pipe().read(read_fn, n_workers=1, buffer_size=20).batch(2),
+        ]:
+            del calls[:]
+            for _ in pipeline:
+                break
+            # Pending items are cancelled, not computed
+            self.assertLess(len(calls), 20)
+
+    def test_processes(self):
+        pipeline = self.tiles.pipe().read(_read_fn, n_workers=2, executor="process").filter(_is_even).map(_square)
+        self.assertEqual(list(pipeline), self._expected())
+
+    def test_roi_tiles(self):
+        tiles = RoiTiles(self.tiles, [(10, 20, 30, 40), (80, 0, 10, 10)])
+        expected = [_square(_read_fn(*t)) for t in tiles if _is_even(_read_fn(*t))]
+        pipeline = tiles.pipe().read(_read_fn, n_workers=2).filter(_is_even).map(_square)
+        self.assertEqual(list(pipeline), expected)
+
+    def test_any_iterable(self):
+        self.assertEqual(list(Pipeline(range(10)).filter(_is_even).map(_square).batch(2)), [[0, 4], [16, 36], [64]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+from tiling import ConstStrideTiles, ConstSizeTiles
+from tiling.planner import plan_tiles, get_tiling_plans
+
+
+class TestPlanner(unittest.TestCase):
+    def test_wrong_args(self):
+        with self.assertRaises(TypeError):
+            plan_tiles(1000, 1024)
+        with self.assertRaises(ValueError):
+            plan_tiles((1000, 1000), 0)
+        with self.assertRaises(ValueError):
+            plan_tiles((1000, 1000), 1024, margin=-1)
+        with self.assertRaises(ValueError):
+            plan_tiles((1000, 1000), 1024, block_size=(0, 10))
+        with self.assertRaises(TypeError):
+            plan_tiles((1000, 1000), 1024, block_size=(10, 10, 10))
+        # Memory budget is too small for any tile
+        with self.assertRaises(ValueError):
+            plan_tiles((1000, 1000), 1024, bytes_per_pixel=4)
+
+    def test_plans(self):
+        image_size = (1000, 800)
+        budget = 8 * 1024 ** 2
+        margin = 8
+        plans = get_tiling_plans(image_size, budget, margin=margin, bytes_per_pixel=12, max_batch_size=16)
+        self.assertGreater(len(plans), 0)
+        best = plan_tiles(image_size, budget, margin=margin, bytes_per_pixel=12, max_batch_size=16)
+        self.assertEqual(best.cost, plans[0].cost)
+        self.assertEqual([p.cost for p in plans], sorted(p.cost for p in plans))
+
+        for plan in plans:
+            tiles = plan.tiles
+            self.assertTrue(isinstance(tiles, (ConstStrideTiles, ConstSizeTiles)), repr(plan))
+            self.assertLessEqual(plan.peak_memory, budget, repr(plan))
+            # Double buffering of read data and output data
+            tile_memory = (tiles.tile_size[0] * tiles.tile_size[1] + tiles.tile_extent[0] * tiles.tile_extent[1]) * 12
+            self.assertEqual(plan.peak_memory, plan.batch_size * tile_memory * 2, repr(plan))
+            self.assertTrue(1 <= plan.batch_size <= 16, repr(plan))
+            self.assertEqual(plan.n_tiles, len(tiles), repr(plan))
+            self.assertGreaterEqual(plan.read_amplification, 1.0, repr(plan))
+            self.assertTrue(0.0 <= plan.padded_fraction < 1.0, repr(plan))
+            if isinstance(tiles, ConstStrideTiles):
+                self.assertEqual(tiles.stride[0], tiles.tile_size[0] - 2 * margin)
+                self.assertEqual(tiles.origin[0], -margin)
+            else:
+                self.assertEqual(plan.padded_fraction, 0.0)
+                self.assertGreaterEqual(tiles.min_overlapping, 2 * margin)
+
+            # Analytical read pixels correspond to tile enumeration
+            read_pixels = 0
+            processed_pixels = 0
+            for extent, out_size in tiles:
+                x, y, w, h = extent
+                w = min(x + w, image_size[0]) - max(x, 0)
+                h = min(y + h, image_size[1]) - max(y, 0)
+                read_pixels += w * h
+                processed_pixels += out_size[0] * out_size[1]
+            self.assertEqual(plan.read_pixels, read_pixels, repr(plan))
+            self.assertEqual(plan.cost, read_pixels + processed_pixels, repr(plan))
+
+    def test_block_size(self):
+        image_size = (1000, 800)
+        plans = get_tiling_plans(image_size, 64 * 1024 ** 2, margin=4, block_size=(128, 64), tile_cost=1e4)
+        for plan in plans:
+            # Reads are aligned on blocks and cropped at image boundaries
+            read_pixels = 0
+            for extent, _ in plan.tiles:
+                x, y, w, h = extent
+                x0, x1 = max(x, 0) // 128 * 128, min(-(-(x + w) // 128) * 128, image_size[0])
+                y0, y1 = max(y, 0) // 64 * 64, min(-(-(y + h) // 64) * 64, image_size[1])
+                read_pixels += (x1 - x0) * (y1 - y0)
+            self.assertEqual(plan.read_pixels, read_pixels, repr(plan))
+        # Tile sizes are multiples of the block size or its fractions
+        for plan in plans:
+            tile_size = plan.tiles.tile_size[0]
+            self.assertTrue(tile_size % 128 == 0 or tile_size in (64, 32), repr(plan))
+
+        plan = plan_tiles(image_size, 64 * 1024 ** 2, tile_sizes=[100, 200], scale=0.5)
+        self.assertIn(plan.tiles.tile_size[0], [100, 200])
+        self.assertEqual(plan.tiles.scale, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import threading
+import time
+import unittest
+
+from tiling import ConstStrideTiles
+from tiling.reader import SharedReader
+
+
+class _CountingReader(object):
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, extent, out_size):
+        with self.lock:
+            self.calls.append((tuple(extent), tuple(out_size)))
+        time.sleep(self.delay)
+        return [extent, out_size]
+
+
+class _Barrier(object):
+    """Reusable barrier, as threading.Barrier is not available in Python 2"""
+
+    def __init__(self, n):
+        self.n = n
+        self.count = 0
+        self.generation = 0
+        self.cond = threading.Condition()
+
+    def wait(self):
+        with self.cond:
+            generation = self.generation
+            self.count += 1
+            if self.count == self.n:
+                self.count = 0
+                self.generation += 1
+                self.cond.notify_all()
+            else:
+                while generation == self.generation:
+                    self.cond.wait()
+
+
+class TestSharedReader(unittest.TestCase):
+    def test_wrong_args(self):
+        with self.assertRaises(TypeError):
+            SharedReader(None)
+        with self.assertRaises(KeyError):
+            SharedReader(lambda e, o: None).release((0, 0, 1, 1), (1, 1))
+
+    def test_single_flight(self):
+        tiles = ConstStrideTiles((100, 120), (32, 32), stride=(20, 20))
+        read_fn = _CountingReader()
+        reader = SharedReader(read_fn)
+        barrier = _Barrier(4)
+        results = [[] for _ in range(4)]
+
+        def _consumer(i):
+            for extent, out_size in tiles:
+                # Consumers hold the tile until all of them have got it
+                with reader.read(extent, out_size) as data:
+                    results[i].append(data)
+                    barrier.wait()
+
+        threads = [threading.Thread(target=_consumer, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(read_fn.calls), len(tiles))
+        self.assertEqual(reader.n_reads, len(tiles))
+        self.assertEqual(reader.n_shared, 3 * len(tiles))
+        self.assertEqual(len(reader), 0)
+        for i in range(1, 4):
+            for a, b in zip(results[0], results[i]):
+                self.assertIs(a, b)
+
+    def test_released_data_is_read_again(self):
+        read_fn = _CountingReader(delay=0.0)
+        reader = SharedReader(read_fn)
+        with reader.read((0, 0, 10, 10), (10, 10)) as data1:
+            with reader.read([0, 0, 10, 10], [10, 10]) as data2:
+                self.assertIs(data1, data2)
+            self.assertEqual(len(reader), 1)
+        self.assertEqual(len(reader), 0)
+        with reader.read((0, 0, 10, 10), (10, 10)):
+            pass
+        self.assertEqual(len(read_fn.calls), 2)
+
+    def test_error(self):
+        calls = []
+
+        def read_fn(extent, out_size):
+            calls.append(extent)
+            if len(calls) == 1:
+                raise IOError("Failed to read")
+            return extent
+
+        reader = SharedReader(read_fn)
+        with self.assertRaises(IOError):
+            reader.acquire((0, 0, 10, 10), (10, 10))
+        self.assertEqual(len(reader), 0)
+        # Next request retries
+        with reader.read((0, 0, 10, 10), (10, 10)) as data:
+            self.assertEqual(data, (0, 0, 10, 10))
+
+
+if __name__ == "__main__":
+    unittest.main()
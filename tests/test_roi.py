@@ -0,0 +1,124 @@
+import unittest
+
+from tiling import BaseTiles, ConstStrideTiles, ConstSizeTiles, RoiTiles
+
+
+def _point_in_polygon(x, y, polygon):
+    inside = False
+    n = len(polygon)
+    for k in range(n):
+        (xa, ya), (xb, yb) = polygon[k], polygon[(k + 1) % n]
+        if (ya <= y) != (yb <= y):
+            if x < xa + (y - ya) * (xb - xa) / (yb - ya):
+                inside = not inside
+    return inside
+
+
+class TestRoiTiles(unittest.TestCase):
+    all_tiles = [
+        ConstStrideTiles((300, 250), (32, 32), stride=(20, 20), origin=(-7, -7), include_nodata=True),
+        ConstStrideTiles((300, 250), (32, 32), stride=(20, 20), origin=(-7, -7), include_nodata=False),
+        ConstStrideTiles((300, 250), (10, 10), stride=(20, 20), include_nodata=False),
+        ConstSizeTiles((300, 250), (32, 32), min_overlapping=7),
+        ConstSizeTiles((300, 250), (32, 32), min_overlapping=7, scale=1.78),
+        # First tiles have an empty extent
+        ConstStrideTiles((300, 250), (5, 5), stride=(4, 4), origin=(-9, -9), include_nodata=False),
+    ]
+
+    def test_wrong_args(self):
+        tiles = self.all_tiles[0]
+        with self.assertRaises(TypeError):
+            RoiTiles(None, [(0, 0), (10, 0), (10, 10)])
+        with self.assertRaises(TypeError):
+            RoiTiles(tiles, "abc")
+        with self.assertRaises(TypeError):
+            RoiTiles(tiles, [(0, 0), (10, 0, 10, 10)])
+        with self.assertRaises(ValueError):
+            RoiTiles(tiles, [(0, 0), (10, 0)])
+        with self.assertRaises(ValueError):
+            RoiTiles(tiles, [(0, 0, 0, 10)])
+        with self.assertRaises(TypeError):
+            RoiTiles(RoiTiles(tiles, [(0, 0, 10, 10)]), [(0, 0, 10, 10)])
+
+    def test_rectangles(self):
+        rectangles = [(50, 60, 40, 30), (57, 75, 1, 1), (200, 10, 120, 15), (-10, 230, 30, 50)]
+        for tiles in self.all_tiles:
+            roi_tiles = RoiTiles(tiles, rectangles)
+            expected = []
+            for idx, (extent, _) in enumerate(tiles):
+                x, y, w, h = extent
+                for rx, ry, rw, rh in rectangles:
+                    if w > 0 and h > 0 and x < rx + rw and rx < x + w and y < ry + rh and ry < y + h:
+                        expected.append(idx)
+                        break
+            self.assertEqual(list(roi_tiles.indices), expected)
+            self.assertEqual(len(roi_tiles), len(expected))
+            self.assertEqual(list(roi_tiles), [tiles[idx] for idx in expected])
+            self.assertEqual(roi_tiles[-1], tiles[expected[-1]])
+            self.assertIn(expected[0], roi_tiles)
+            with self.assertRaises(IndexError):
+                roi_tiles[len(expected)]
+
+    def test_polygon(self):
+        polygons = [
+            [(10.5, 20.5), (250.5, 40.5), (120.5, 200.5)],
+            # Concave polygon with a hole-like notch
+            [(20, 20), (280, 20), (280, 220), (150, 220), (150, 60), (100, 60), (100, 220), (20, 220)],
+            # Thin polygon smaller than a tile
+            [(123, 77), (125, 77), (125, 78)],
+        ]
+        for tiles in self.all_tiles:
+            for polygon in polygons:
+                roi_tiles = RoiTiles(tiles, polygon)
+                selected = set(roi_tiles.indices)
+                self.assertEqual(list(roi_tiles.indices), sorted(selected))
+                self.assertTrue(all(extent[2] > 0 and extent[3] > 0 for extent, _ in roi_tiles))
+                x_min = min(p[0] for p in polygon)
+                x_max = max(p[0] for p in polygon)
+                y_min = min(p[1] for p in polygon)
+                y_max = max(p[1] for p in polygon)
+
+                for idx, (extent, _) in enumerate(tiles):
+                    x, y, w, h = extent
+                    # Tiles with a polygon point inside should be selected
+                    inside = any(
+                        _point_in_polygon(x + i + 0.25, y + j + 0.25, polygon) for i in range(w) for j in range(h)
+                    )
+                    if inside:
+                        self.assertIn(idx, selected, "polygon={} extent={}".format(polygon, extent))
+                    # Tiles out of the polygon bounding box should not be selected
+                    if x >= x_max or x + w <= x_min or y >= y_max or y + h <= y_min:
+                        self.assertNotIn(idx, selected, "polygon={} extent={}".format(polygon, extent))
+
+    def test_notch_is_skipped(self):
+        tiles = ConstStrideTiles((300, 300), (10, 10), stride=(10, 10), include_nodata=False)
+        polygon = [(0, 0), (300, 0), (300, 300), (200, 300), (200, 100), (100, 100), (100, 300), (0, 300)]
+        roi_tiles = RoiTiles(tiles, polygon)
+        self.assertEqual(len(roi_tiles), 900 - 10 * 20)
+        for extent, _ in roi_tiles:
+            x, y, w, h = extent
+            self.assertFalse(100 <= x < 200 and y >= 100)
+
+    def test_base_tiles(self):
+        rectangles = [(50, 60, 40, 30), (200, 10, 120, 15)]
+        for tiles in self.all_tiles:
+            roi_tiles = RoiTiles(tiles, rectangles)
+            self.assertIsInstance(roi_tiles, BaseTiles)
+            expected = [tiles[idx] for idx in roi_tiles.indices]
+            self.assertEqual([t for t in roi_tiles], expected)
+            self.assertEqual(list(roi_tiles.pipe()), expected)
+            self.assertEqual(list(roi_tiles.get_extents()), [e for e, _ in expected])
+            self.assertEqual(roi_tiles.get_extent(-1), expected[-1][0])
+            core_extents = tiles.get_core_extents()
+            self.assertEqual(roi_tiles.get_core_extents(), [core_extents[idx] for idx in roi_tiles.indices])
+            self.assertEqual(roi_tiles.get_core_extent(0), tiles.get_core_extent(roi_tiles.indices[0]))
+            with self.assertRaises(IndexError):
+                roi_tiles.get_extent(len(roi_tiles))
+            with self.assertRaises(IndexError):
+                roi_tiles.get_core_extent(len(roi_tiles))
+            with self.assertRaises(NotImplementedError):
+                roi_tiles.get_axis_tiles(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+import numpy as np
+
+from tiling import ConstStrideTiles, ConstSizeTiles
+from tiling.writer import TileWriter
+
+
+class _ChunkedArray(object):
+    """Array-like with chunks counting writes"""
+
+    def __init__(self, shape, chunks):
+        self.data = np.zeros(shape, dtype=np.int32)
+        self.shape = self.data.shape
+        self.dtype = self.data.dtype
+        self.chunks = chunks
+        self.n_writes = 0
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self.n_writes += 1
+        self.data[key] = value
+
+
+def _read_data(image, extent, out_size):
+    x, y, w, h = extent
+    data = np.zeros((h, w), dtype=image.dtype)
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + w, image.shape[1]), min(y + h, image.shape[0])
+    data[y0 - y:y1 - y, x0 - x:x1 - x] = image[y0:y1, x0:x1]
+    return data
+
+
+class TestTileWriter(unittest.TestCase):
+    def test_wrong_args(self):
+        assertRaisesRegex = self.assertRaisesRegex if hasattr(self, "assertRaisesRegex") else self.assertRaisesRegexp
+
+        with assertRaisesRegex(TypeError, "Argument output should be an array"):
+            TileWriter(np.zeros(10))
+
+        with assertRaisesRegex(ValueError, "Argument tiles should be provided"):
+            TileWriter(np.zeros((10, 10)), crop_core=True)
+
+        with assertRaisesRegex(TypeError, "Argument block_size should be"):
+            TileWriter(np.zeros((10, 10)), block_size="abc")
+
+        with assertRaisesRegex(ValueError, "Values of block_size should be positive"):
+            TileWriter(np.zeros((10, 10)), block_size=(0, 10))
+
+        writer = TileWriter(np.zeros((10, 10)))
+        with assertRaisesRegex(ValueError, "Tile data shape"):
+            writer.write((0, 0, 5, 5), (5, 5), np.zeros((4, 5)))
+
+        with self.assertRaises(RuntimeError):
+            writer.write_tile(0, np.zeros((5, 5)))
+
+    def test_mosaic(self):
+        image = np.arange(120 * 100, dtype=np.int32).reshape((120, 100))
+
+        def _test(tiles, **kwargs):
+            output = np.zeros_like(image)
+            with TileWriter(output, tiles=tiles, **kwargs) as writer:
+                for idx, (extent, out_size) in enumerate(tiles):
+                    writer.write_tile(idx, _read_data(image, extent, out_size))
+            np.testing.assert_array_equal(output, image)
+
+        all_tiles = [
+            ConstStrideTiles((100, 120), (32, 32), stride=(20, 20), origin=(-7, -7), include_nodata=True),
+            ConstStrideTiles((100, 120), (32, 32), stride=(20, 20), origin=(-7, -7), include_nodata=False),
+            ConstStrideTiles((100, 120), (32, 32), stride=(32, 32), include_nodata=False),
+            ConstSizeTiles((100, 120), (32, 32), min_overlapping=7),
+        ]
+        for tiles in all_tiles:
+            for crop_core in [False, True]:
+                for block_size in [None, 16, (13, 17)]:
+                    _test(tiles, crop_core=crop_core, block_size=block_size)
+
+    def test_coalesced_writes(self):
+        tiles = ConstStrideTiles((100, 120), (10, 10), stride=(10, 10), include_nodata=False)
+        output = _ChunkedArray((120, 100), chunks=(40, 50))
+        writer = TileWriter(output)
+        self.assertEqual(writer.block_size, (50, 40))
+        for extent, out_size in tiles:
+            writer.write(extent, out_size, np.ones((out_size[1], out_size[0]), dtype=np.int32))
+        # Each block is written once it is fully covered
+        self.assertEqual(output.n_writes, 6)
+        self.assertEqual(len(writer._blocks), 0)
+        np.testing.assert_array_equal(output.data, 1)
+
+    def test_partial_flush(self):
+        output = np.full((20, 20), -1, dtype=np.int32)
+        writer = TileWriter(output, block_size=(10, 10))
+        writer.write((5, 5, 10, 10), (10, 10), np.ones((10, 10), dtype=np.int32))
+        np.testing.assert_array_equal(output, -1)
+        writer.close()
+        self.assertEqual(output[5:15, 5:15].min(), 1)
+        self.assertEqual((output == 1).sum(), 100)
+        self.assertEqual((output == -1).sum(), 300)
+
+    def test_scale(self):
+        image = np.arange(60 * 40, dtype=np.int32).reshape((60, 40))
+        scale = 0.5
+        tiles = ConstStrideTiles((40, 60), (10, 10), stride=(10, 10), scale=scale, include_nodata=False)
+        for crop_core in [False, True]:
+            output = np.zeros((30, 20), dtype=np.int32)
+            writer = TileWriter(output, tiles=tiles, crop_core=crop_core)
+            self.assertEqual(writer.scale, scale)
+            for idx, (extent, out_size) in enumerate(tiles):
+                x, y, w, h = extent
+                writer.write_tile(idx, image[y:y + h:2, x:x + w:2])
+            np.testing.assert_array_equal(output, image[::2, ::2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from array import array
 import math
 
 try:
@@ -6,13 +7,17 @@ try:
 except ImportError:
     from collections import Sequence
 
-from six import with_metaclass
+from tiling.extents import Extent, Extents
 
 
 __version__ = "0.3.0"
 
 
-class BaseTiles(with_metaclass(ABCMeta, object)):
+# Python 2 and 3 compatible abstract base class, without third-party dependencies
+_ABC = ABCMeta("_ABC", (object,), {"__slots__": ()})
+
+
+class BaseTiles(_ABC):
     """
     Base class to tile an image.
     See the implementations
@@ -93,6 +98,167 @@ class BaseTiles(with_metaclass(ABCMeta, object)):
 
     __next__ = next
 
+    def pipe(self):
+        """Method to start a lazy pipeline over the tiles, see :class:`tiling.pipeline.Pipeline`
+
+        Returns:
+            (Pipeline) pipeline yielding tiles `(extent, out_size)`
+        """
+        from tiling.pipeline import Pipeline
+
+        return Pipeline(self)
+
+    def get_extent(self, idx, out=None):
+        """Method to get only the extent of the tile at index `idx`.
+        Implementations compute the extent directly, without the tile output size and intermediate tuples.
+
+        Args:
+            idx: (int) tile index between `0` and `len(tiles)`
+            out (mutable sequence, optional): preallocated sequence of 4 integers to fill with the extent, e.g.
+                a view from :meth:`Extents.view`. If None, a new :class:`Extent` record is returned.
+
+        Returns:
+            (Extent or out) tile extent in pixels: x offset, y offset, x extent, y extent
+        """
+        extent, _ = self[idx]
+        if out is None:
+            return Extent._make(extent)
+        out[0], out[1], out[2], out[3] = extent
+        return out
+
+    def get_extents(self, out=None):
+        """Method to get extents of all tiles as a compact :class:`Extents` container.
+        Extents are computed once per column and row of tiles.
+
+        Args:
+            out (Extents, optional): preallocated container to fill, of size `len(tiles)`
+
+        Returns:
+            (Extents) tile extents, ordered as tiles
+        """
+        if out is None:
+            out = Extents(len(self))
+        elif len(out) != len(self):
+            raise ValueError("Argument out should contain {} extents, but has {}".format(len(self), len(out)))
+
+        row = Extents.from_iterable((x, 0, w, 0) for x, w, _ in self.get_axis_tiles(0)).data
+        row_size = len(row)
+        for j, (y, h, _) in enumerate(self.get_axis_tiles(1)):
+            row[1::4] = array(row.typecode, [y]) * self.nx
+            row[3::4] = array(row.typecode, [h]) * self.nx
+            out.data[j * row_size:(j + 1) * row_size] = row
+        return out
+
+    def get_axis_tiles(self, axis, indices=None):
+        """Method to get tiles along an axis: tiles of columns (axis=0) or rows (axis=1).
+        Tile extent and output size along x depend only on the column of the tile, along y only on its row. Thus, the
+        tile at column `i` and row `j` is made of `get_axis_tiles(0)[i]` and `get_axis_tiles(1)[j]`.
+
+        Args:
+            axis (int): 0 for columns, 1 for rows
+            indices (iterable of int, optional): column or row indices. By default, all columns or rows.
+
+        Returns:
+            (list) of tuples offset, extent, output size along the axis, in pixels
+        """
+        if axis not in (0, 1):
+            raise ValueError("Argument axis should be 0 or 1")
+        step = 1 if axis == 0 else self.nx
+        if indices is None:
+            indices = range(self.nx if axis == 0 else self.ny)
+        res = []
+        for i in indices:
+            extent, out_size = self[i * step]
+            res.append((extent[axis], extent[axis + 2], out_size[axis]))
+        return res
+
+    def get_core_extent(self, idx):
+        """Method to get the core region of the tile at index `idx`
+
+        Core regions of all tiles make a partition of the image: each pixel belongs to the core of the tile whose
+        centre is the nearest. Writing only core regions of tile outputs stitches them without any redundant work.
+
+        Args:
+            idx: (int) tile index between `0` and `len(tiles)`
+
+        Returns:
+            (tuple) core extent in the original image, core extent in the tile output, in pixels:
+            x offset, y offset, x extent, y extent. Core extent in the tile output is mapped with the scale.
+        """
+        if idx < -len(self) or idx >= len(self):
+            raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, len(self)))
+
+        idx = idx % len(self)
+        x_index = idx % self.nx
+        y_index = idx // self.nx
+        # Only the neighbour tiles are needed
+        x_cores = self._compute_axis_cores(0, range(max(x_index - 1, 0), min(x_index + 2, self.nx)))
+        y_cores = self._compute_axis_cores(1, range(max(y_index - 1, 0), min(y_index + 2, self.ny)))
+        return self._combine_cores(x_cores[min(x_index, 1)], y_cores[min(y_index, 1)])
+
+    def get_core_extents(self):
+        """Method to get core regions of all tiles, see :meth:`get_core_extent`.
+        Core regions are computed once per column and row of tiles.
+
+        Returns:
+            (list) of tuples core extent in the original image, core extent in the tile output, ordered as tiles
+        """
+        x_cores = self._compute_axis_cores(0, range(self.nx))
+        y_cores = self._compute_axis_cores(1, range(self.ny))
+        return [self._combine_cores(x_core, y_core) for y_core in y_cores for x_core in x_cores]
+
+    def _compute_axis_cores(self, axis, indices):
+        """Method to compute core regions along an axis for tiles of given column (axis=0) or row (axis=1) indices
+        """
+        tiles = self.get_axis_tiles(axis, indices)
+        offsets = [offset for offset, _, _ in tiles]
+        extents = [extent for _, extent, _ in tiles]
+        cores = BaseTiles._compute_core_1d(offsets, extents, self.image_size[axis])
+
+        res = []
+        for (start, end), (offset, _, out_size) in zip(cores, tiles):
+            tile_start = int(round(offset * self.scale))
+            out_start = min(max(int(round(start * self.scale)) - tile_start, 0), out_size)
+            out_end = min(max(int(round(end * self.scale)) - tile_start, out_start), out_size)
+            res.append((start, end - start, out_start, out_end - out_start))
+        return res
+
+    @staticmethod
+    def _combine_cores(x_core, y_core):
+        return (
+            (x_core[0], y_core[0], x_core[1], y_core[1]),
+            (x_core[2], y_core[2], x_core[3], y_core[3]),
+        )
+
+    @staticmethod
+    def _compute_core_1d(offsets, extents, image_size):
+        """Method to compute core regions (start, end) along one axis.
+        Pixel belongs to the tile with the nearest centre.
+        """
+        starts = [max(offsets[0], 0)]
+        ends = []
+        for i in range(len(offsets) - 1):
+            # Pixel p (with centre p + 0.5) belongs to the next tile if p + 0.5 >= middle between the centres
+            middle = (offsets[i] + extents[i] * 0.5 + offsets[i + 1] + extents[i + 1] * 0.5) * 0.5
+            bound = int(math.ceil(middle - 0.5))
+            low, high = offsets[i + 1], offsets[i] + extents[i]
+            if low <= high:
+                # Tiles overlap: the bound should be inside the overlapping part, e.g. for cropped boundary tiles
+                bound = min(max(bound, low), high)
+                ends.append(bound)
+                starts.append(bound)
+            else:
+                ends.append(high)
+                starts.append(low)
+        ends.append(min(offsets[-1] + extents[-1], image_size))
+
+        res = []
+        for start, end in zip(starts, ends):
+            start = min(max(start, 0), image_size)
+            end = max(min(end, image_size), start)
+            res.append((start, end))
+        return res
+
 
 def ceil_int(x):
     return int(math.ceil(x))
@@ -100,3 +266,4 @@ def ceil_int(x):
 
 from tiling.const_stride import ConstStrideTiles
 from tiling.const_size import ConstSizeTiles
+from tiling.roi import RoiTiles
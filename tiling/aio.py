@@ -0,0 +1,137 @@
+# -*- coding:utf-8 -*-
+import asyncio
+import functools
+import inspect
+
+from tiling.reader import _Entry, _get_key
+
+
+class AsyncSharedReader(object):
+    """Class provides an asyncio shared front-end to a tile reader for concurrent consumers of the same tiles.
+    Same as :class:`tiling.reader.SharedReader` for coroutines running in a single event loop. Reads run in their own
+    tasks: a cancelled consumer does not cancel the read awaited by other consumers, and a read is cancelled only
+    when all its consumers are cancelled.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling.aio import AsyncSharedReader
+
+            async def read_fn(extent, out_size):
+                x, y, width, height = extent
+                return await read_data(x, y, width, height, out_width=out_size[0], out_height=out_size[1])
+
+            reader = AsyncSharedReader(read_fn)
+
+            async def head(tiles):
+                for extent, out_size in tiles:
+                    async with reader.read(extent, out_size) as data:
+                        await predict(data)
+
+    Args:
+        read_fn (callable): coroutine function `read_fn(extent, out_size)` returning tile data. A regular function is
+            executed in the default executor of the event loop.
+    """
+
+    def __init__(self, read_fn):
+        if not callable(read_fn):
+            raise TypeError("Argument read_fn should be callable")
+        self.read_fn = read_fn
+        self.n_reads = 0
+        self.n_shared = 0
+        self._entries = {}
+
+    def __len__(self):
+        """Method to get number of tiles in flight or held by consumers
+        """
+        return len(self._entries)
+
+    async def _read(self, extent, out_size):
+        if inspect.iscoroutinefunction(self.read_fn):
+            return await self.read_fn(extent, out_size)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.read_fn, extent, out_size))
+
+    async def acquire(self, extent, out_size):
+        """Method to get tile data, reading it only if it is not already in flight or held by another consumer.
+        Each call should be paired with :meth:`release`.
+
+        Args:
+            extent (list/tuple of int): tile extent in pixels: x, y, width, height
+            out_size (list/tuple of int): tile output size in pixels: width, height
+
+        Returns:
+            tile data returned by `read_fn`
+        """
+        key = _get_key(extent, out_size)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.count += 1
+            self.n_shared += 1
+        else:
+            # The read runs in its own task, such that it is not cancelled with the consumer which started it
+            entry = _Entry(asyncio.ensure_future(self._read(extent, out_size)))
+            self._entries[key] = entry
+            self.n_reads += 1
+
+        try:
+            return await asyncio.shield(entry.ready)
+        except asyncio.CancelledError:
+            if entry.ready.cancelled():
+                raise
+            # Only this consumer is cancelled, the read goes on for the other ones
+            self._release_entry(key, entry)
+            raise
+        except BaseException:
+            # Failed read is not shared with further requests, they will retry
+            self._remove_entry(key, entry)
+            raise
+
+    def release(self, extent, out_size):
+        """Method to release tile data acquired with :meth:`acquire`. Data is freed when the last consumer releases it.
+
+        Args:
+            extent (list/tuple of int): tile extent in pixels: x, y, width, height
+            out_size (list/tuple of int): tile output size in pixels: width, height
+        """
+        key = _get_key(extent, out_size)
+        entry = self._entries.get(key)
+        if entry is None:
+            raise KeyError("Tile {} is not acquired".format(key))
+        self._release_entry(key, entry)
+
+    def _release_entry(self, key, entry):
+        entry.count -= 1
+        if entry.count == 0:
+            # Nobody waits for the read anymore
+            entry.ready.cancel()
+            self._remove_entry(key, entry)
+
+    def _remove_entry(self, key, entry):
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+
+    def read(self, extent, out_size):
+        """Method to acquire tile data in an `async with` statement, data is released at exit
+
+        Args:
+            extent (list/tuple of int): tile extent in pixels: x, y, width, height
+            out_size (list/tuple of int): tile output size in pixels: width, height
+        """
+        return _AsyncReadContext(self, extent, out_size)
+
+
+class _AsyncReadContext(object):
+    __slots__ = ("reader", "extent", "out_size")
+
+    def __init__(self, reader, extent, out_size):
+        self.reader = reader
+        self.extent = extent
+        self.out_size = out_size
+
+    async def __aenter__(self):
+        return await self.reader.acquire(self.extent, self.out_size)
+
+    async def __aexit__(self, *args):
+        self.reader.release(self.extent, self.out_size)
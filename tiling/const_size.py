@@ -1,9 +1,6 @@
 # -*- coding:utf-8 -*-
-import logging
 from tiling import BaseTiles, ceil_int
-
-
-logger = logging.getLogger("tiling")
+from tiling.extents import Extent
 
 
 class ConstSizeTiles(BaseTiles):
@@ -82,6 +79,26 @@ class ConstSizeTiles(BaseTiles):
         offset = int(round(idx * (tile_extent - overlapping)))
         return offset, int(round(tile_extent))
 
+    def get_extent(self, idx, out=None):
+        """Method to get only the extent of the tile at index `idx`, see :meth:`BaseTiles.get_extent`
+        """
+        if idx < -self._max_index or idx >= self._max_index:
+            raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, self._max_index))
+
+        idx = idx % self._max_index
+        # Same as _compute_tile_extent, inlined: tile extent is an integer
+        x_extent, y_extent = self.tile_extent
+        x_offset = int(round((idx % self.nx) * (x_extent - self.float_overlapping_x)))
+        y_offset = int(round((idx // self.nx) * (y_extent - self.float_overlapping_y)))
+        if out is None:
+            # Bypass the namedtuple constructor, arguments are already positional
+            return tuple.__new__(Extent, (x_offset, y_offset, x_extent, y_extent))
+        out[0] = x_offset
+        out[1] = y_offset
+        out[2] = x_extent
+        out[3] = y_extent
+        return out
+
     def __getitem__(self, idx):
         """Method to get the tile at index `idx`
 
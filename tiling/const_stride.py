@@ -1,5 +1,4 @@
 # -*- coding:utf-8 -*-
-import logging
 import math
 
 try:
@@ -8,8 +7,7 @@ except ImportError:
     from collections import Sequence
 
 from tiling import BaseTiles, ceil_int
-
-logger = logging.getLogger("tiling")
+from tiling.extents import Extent
 
 
 class ConstStrideTiles(BaseTiles):
@@ -74,6 +72,8 @@ class ConstStrideTiles(BaseTiles):
             self.image_size[1], self.tile_extent[1], self.origin[1], self.stride[1]
         )
         self._max_index = self.nx * self.ny
+        self._n_emitted_rows = 0
+        self._finalized = False
 
     def __len__(self):
         """Method to get total number of tiles
@@ -102,6 +102,30 @@ class ConstStrideTiles(BaseTiles):
             return ceil_int(1.0 * computed_extent * scale)
         return tile_size
 
+    def get_extent(self, idx, out=None):
+        """Method to get only the extent of the tile at index `idx`, see :meth:`BaseTiles.get_extent`
+        """
+        if idx < -self._max_index or idx >= self._max_index:
+            raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, self._max_index))
+
+        idx = idx % self._max_index
+        x_index = idx % self.nx
+        y_index = idx // self.nx
+        x_offset, x_extent = self._compute_tile_extent(
+            x_index, self.tile_extent[0], self.stride[0], self.origin[0], self.image_size[0], self.include_nodata,
+        )
+        y_offset, y_extent = self._compute_tile_extent(
+            y_index, self.tile_extent[1], self.stride[1], self.origin[1], self.image_size[1], self.include_nodata,
+        )
+        if out is None:
+            # Bypass the namedtuple constructor, arguments are already positional
+            return tuple.__new__(Extent, (x_offset, y_offset, x_extent, y_extent))
+        out[0] = x_offset
+        out[1] = y_offset
+        out[2] = x_extent
+        out[3] = y_extent
+        return out
+
     def __getitem__(self, idx):
         """Method to get the tile at index `idx`
 
@@ -142,6 +166,61 @@ class ConstStrideTiles(BaseTiles):
         )
         return (x_offset, y_offset, x_extent, y_extent), (x_out_size, y_out_size)
 
+    def extend(self, new_height, final=False):
+        """Method to grow the image height and get the newly completed tiles
+
+        Useful when the image is still being written, e.g. line-scan acquisition. Tiles are indexed row by row,
+        so growing the height appends new rows of tiles and indices of already returned tiles remain valid.
+        A tile is completed when its full extent `y + tile_extent` lies inside the current image height.
+        Each completed tile is returned once over successive calls, starting with the tiles completed in the initial
+        image height.
+
+        As for any tiles, the initial image height given to the constructor should be larger than the tile extent
+        `tile_size[1] / scale`. Thus, tiles can be created only once more than a tile extent of rows is available.
+
+        Args:
+            new_height (int): current image height in pixels, should not be smaller than the previous one
+            final (bool): if True, the image is considered complete and all remaining tiles are returned,
+                including the ones going outside the image. No further extension is possible after that.
+
+        Returns:
+            (list) of tuples `(idx, (extent, out_size))` for the newly completed tiles, with `tiles[idx]`
+            equal to `(extent, out_size)`
+        """
+        if self._finalized:
+            raise RuntimeError("Tiles can not be extended after a final extension")
+        if new_height < self.image_size[1]:
+            raise ValueError(
+                "Argument new_height should not be smaller than current image height {}, "
+                "but given {}".format(self.image_size[1], new_height)
+            )
+
+        self.image_size = (self.image_size[0], new_height)
+        self.ny = ConstStrideTiles._compute_number_of_tiles(
+            self.image_size[1], self.tile_extent[1], self.origin[1], self.stride[1]
+        )
+        self._max_index = self.nx * self.ny
+
+        if final:
+            self._finalized = True
+            n_completed_rows = self.ny
+        else:
+            n_completed_rows = ConstStrideTiles._compute_number_of_completed_tiles(
+                self.image_size[1], self.tile_extent[1], self.origin[1], self.stride[1]
+            )
+            n_completed_rows = min(n_completed_rows, self.ny)
+
+        start = self._n_emitted_rows * self.nx
+        stop = max(n_completed_rows, self._n_emitted_rows) * self.nx
+        self._n_emitted_rows = stop // self.nx
+        return [(idx, self[idx]) for idx in range(start, stop)]
+
+    @staticmethod
+    def _compute_number_of_completed_tiles(image_size, tile_extent, origin, stride):
+        """Method to compute number of tiles fully contained in the image
+        """
+        return max(int(math.floor(1 + (image_size - tile_extent - origin) * 1.0 / stride)), 0)
+
     @staticmethod
     def _compute_number_of_tiles(image_size, tile_extent, origin, stride):
         """Method to compute number of overlapping tiles
@@ -0,0 +1,241 @@
+# -*- coding:utf-8 -*-
+import os
+import sys
+
+from tiling import BaseTiles, RoiTiles
+
+
+def get_worker_info():
+    """Method to get the current data loader worker as `(worker_id, num_workers)`.
+    PyTorch worker information is used if PyTorch is already imported, otherwise returns `(0, 1)`.
+    """
+    # Do not import torch if it is not already used
+    torch_data = sys.modules.get("torch.utils.data")
+    if torch_data is not None:
+        info = torch_data.get_worker_info()
+        if info is not None:
+            return info.id, info.num_workers
+    return 0, 1
+
+
+class TilesDataset(object):
+    """Class provides a framework-agnostic map-style dataset over tiles.
+
+    Reader is opened lazily, once per worker process, on first access. It is not pickled with the dataset, thus
+    each data loader worker opens its own reader. Batched lookups (`__getitems__`, used by PyTorch data loaders)
+    compute tile extents from per column and per row extents without calling `tiles[idx]` for each tile.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling import ConstSizeTiles
+            from tiling.dataset import TilesDataset
+
+            def open_reader():
+                img = open_image(path)
+
+                def read_fn(extent, out_size):
+                    x, y, width, height = extent
+                    return img.read(x, y, width, height, out_size[0], out_size[1])
+
+                return read_fn
+
+            tiles = ConstSizeTiles(image_size=(50000, 50000), tile_size=(256, 256), min_overlapping=15)
+            dataset = TilesDataset(tiles, open_reader)
+
+            data = dataset[10]
+            batch = dataset.__getitems__([0, 1, 2, 3])
+
+    Args:
+        tiles (BaseTiles): tiles
+        open_reader (callable): function without arguments returning a function `read_fn(extent, out_size)` which
+            returns a sample. It should be picklable to be used with multiprocessing workers.
+        transform (callable, optional): function applied on each sample
+    """
+
+    def __init__(self, tiles, open_reader, transform=None):
+        if not isinstance(tiles, BaseTiles):
+            raise TypeError("Argument tiles should be an instance of BaseTiles")
+        if not callable(open_reader):
+            raise TypeError("Argument open_reader should be callable")
+        if transform is not None and not callable(transform):
+            raise TypeError("Argument transform should be callable")
+        self.tiles = tiles
+        self.open_reader = open_reader
+        self.transform = transform
+        self._reader = None
+        self._pid = None
+        self._axis_tiles = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Readers are opened per worker process
+        state["_reader"] = None
+        state["_pid"] = None
+        return state
+
+    @property
+    def reader(self):
+        """Reader function of the current process, opened on first access
+        """
+        pid = os.getpid()
+        if self._reader is None or self._pid != pid:
+            self._reader = self.open_reader()
+            self._pid = pid
+        return self._reader
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def __getitem__(self, idx):
+        extent, out_size = self.tiles[idx]
+        return self._read(extent, out_size)
+
+    def __getitems__(self, indices):
+        """Method to get samples of a batch of indices
+
+        Args:
+            indices (list of int): tile indices
+
+        Returns:
+            (list) of samples
+        """
+        return [self._read(extent, out_size) for extent, out_size in self.get_tiles(indices)]
+
+    def get_tiles(self, indices):
+        """Method to get tile extents and output sizes of a batch of indices, as `[tiles[idx] for idx in indices]`
+
+        Args:
+            indices (list of int): tile indices
+
+        Returns:
+            (list) of tuples tile extent, output size
+        """
+        tiles = self.tiles
+        n = len(tiles)
+        roi_indices = None
+        if isinstance(tiles, RoiTiles):
+            # Tiles intersecting a ROI are tiles of the restricted grid
+            roi_indices = tiles.indices
+            tiles = tiles.tiles
+        # Tiles can grow, e.g. with ConstStrideTiles.extend
+        key = (tiles.nx, tiles.ny, tuple(tiles.image_size))
+        if self._axis_tiles is None or self._axis_tiles[0] != key:
+            self._axis_tiles = (key, tiles.get_axis_tiles(0), tiles.get_axis_tiles(1))
+        _, x_tiles, y_tiles = self._axis_tiles
+        nx = tiles.nx
+        res = []
+        for idx in indices:
+            if idx < -n or idx >= n:
+                raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, n))
+            idx = idx % n
+            if roi_indices is not None:
+                idx = roi_indices[idx]
+            x, w, ow = x_tiles[idx % nx]
+            y, h, oh = y_tiles[idx // nx]
+            res.append(((x, y, w, h), (ow, oh)))
+        return res
+
+    def _read(self, extent, out_size):
+        sample = self.reader(extent, out_size)
+        if self.transform is not None:
+            sample = self.transform(sample)
+        return sample
+
+
+class IterableTilesDataset(TilesDataset):
+    """Class provides a framework-agnostic iterable dataset over tiles, split across data loader workers.
+
+    Each worker iterates over a contiguous part of the tiles, such that workers do not read overlapping ranges.
+    Worker is identified with `get_worker_info`, by default from PyTorch if it is used.
+
+    Args:
+        tiles (BaseTiles): tiles
+        open_reader (callable): function without arguments returning a function `read_fn(extent, out_size)` which
+            returns a sample. It should be picklable to be used with multiprocessing workers.
+        transform (callable, optional): function applied on each sample
+        get_worker_info (callable, optional): function without arguments returning `(worker_id, num_workers)`
+        batch_size (int): number of tile extents computed at once
+    """
+
+    def __init__(self, tiles, open_reader, transform=None, get_worker_info=get_worker_info, batch_size=64):
+        super(IterableTilesDataset, self).__init__(tiles, open_reader, transform=transform)
+        if batch_size < 1:
+            raise ValueError("Argument batch_size should be positive")
+        self.get_worker_info = get_worker_info
+        self.batch_size = batch_size
+
+    def get_worker_range(self, worker_id, num_workers):
+        """Method to get the range of tile indices of a worker
+
+        Returns:
+            (range) tile indices
+        """
+        n = len(self.tiles)
+        return range(worker_id * n // num_workers, (worker_id + 1) * n // num_workers)
+
+    def __iter__(self):
+        indices = self.get_worker_range(*self.get_worker_info())
+        for start in range(indices.start, indices.stop, self.batch_size):
+            for extent, out_size in self.get_tiles(range(start, min(start + self.batch_size, indices.stop))):
+                yield self._read(extent, out_size)
+
+
+def to_torch_dataset(dataset):
+    """Method to wrap a dataset into PyTorch `Dataset` or `IterableDataset`. Requires `torch`.
+
+    Args:
+        dataset (TilesDataset or IterableTilesDataset): dataset to wrap
+
+    Returns:
+        `TorchTilesDataset` (`torch.utils.data.Dataset`) or `TorchIterableTilesDataset`
+        (`torch.utils.data.IterableDataset`)
+    """
+    if isinstance(dataset, IterableTilesDataset):
+        return _get_torch_class("TorchIterableTilesDataset")(dataset)
+    if isinstance(dataset, TilesDataset):
+        return _get_torch_class("TorchTilesDataset")(dataset)
+    raise TypeError("Argument dataset should be an instance of TilesDataset or IterableTilesDataset")
+
+
+def _get_torch_class(name):
+    """Method to create PyTorch dataset classes on first use, such that torch is imported only if needed
+    """
+    if name in globals():
+        return globals()[name]
+
+    from torch.utils.data import Dataset, IterableDataset
+
+    class TorchTilesDataset(Dataset):
+        def __init__(self, dataset):
+            self.dataset = dataset
+
+        def __len__(self):
+            return len(self.dataset)
+
+        def __getitem__(self, idx):
+            return self.dataset[idx]
+
+        def __getitems__(self, indices):
+            return self.dataset.__getitems__(indices)
+
+    class TorchIterableTilesDataset(IterableDataset):
+        def __init__(self, dataset):
+            self.dataset = dataset
+
+        def __iter__(self):
+            return iter(self.dataset)
+
+    for cls in (TorchTilesDataset, TorchIterableTilesDataset):
+        # Make classes picklable as module attributes
+        cls.__qualname__ = cls.__name__
+        cls.__module__ = __name__
+        globals()[cls.__name__] = cls
+    return globals()[name]
+
+
+def __getattr__(name):
+    if name in ("TorchTilesDataset", "TorchIterableTilesDataset"):
+        return _get_torch_class(name)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
@@ -0,0 +1,150 @@
+# -*- coding:utf-8 -*-
+from collections import OrderedDict
+import hashlib
+import threading
+
+
+def _get_hash_fn():
+    try:
+        import xxhash
+
+        return lambda buffer: xxhash.xxh3_128_digest(buffer)
+    except ImportError:
+        return lambda buffer: hashlib.blake2b(buffer, digest_size=16).digest()
+
+
+_hash_fn = None
+
+
+def get_content_key(data):
+    """Method to get a hashable key of tile data content. Tiles with the same key have the same content, dtype and
+    shape. Constant tiles, e.g. nodata padding, are detected with a vectorized check without hashing their data.
+    Otherwise, data is hashed with `xxhash` if installed, else with `hashlib.blake2b`.
+
+    Args:
+        data (ndarray or bytes-like object): tile data, e.g. a numpy array
+
+    Returns:
+        (tuple) content key
+    """
+    global _hash_fn
+    if _hash_fn is None:
+        _hash_fn = _get_hash_fn()
+
+    if not hasattr(data, "dtype"):
+        return ("bytes", _hash_fn(data))
+
+    # Data is an array, numpy is already imported
+    import numpy as np
+
+    header = (data.dtype.str, data.shape)
+    # At most one copy, used for both the constant check and the hash
+    data = np.ascontiguousarray(data)
+    if data.size > 0:
+        flat = data.reshape(-1)
+        first = flat[0]
+        # Cheap samples reject most non-constant tiles before the full vectorized check
+        if flat[-1] == first and flat[flat.size // 2] == first and (flat == first).all():
+            return ("const",) + header + (first.tobytes(),)
+    return ("data",) + header + (_hash_fn(data),)
+
+
+class Deduplicator(object):
+    """Class provides a function computing `fn(data)` once per unique tile content and replaying cached results for
+    tiles with identical content, e.g. uniform areas like clouds, water or nodata padding.
+
+    Results are kept in a LRU cache of `max_size` entries. The same result object is returned for duplicated tiles,
+    it should not be modified in-place. The deduplicator is thread-safe, however identical tiles computed concurrently
+    may be computed more than once.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling import ConstSizeTiles
+            from tiling.dedup import Deduplicator
+
+            tiles = ConstSizeTiles(image_size=(50000, 50000), tile_size=(256, 256), min_overlapping=15)
+            predict_once = Deduplicator(predict, max_size=256)
+
+            for batch in tiles.pipe().read(read_fn, n_workers=8).map(predict_once):
+                ...
+
+            print(predict_once.stats)
+
+    Args:
+        fn (callable): function applied on tile data
+        max_size (int): maximal number of cached results
+        key_fn (callable): function returning a hashable key of tile data content, see :func:`get_content_key`
+    """
+
+    def __init__(self, fn, max_size=128, key_fn=get_content_key):
+        if not callable(fn):
+            raise TypeError("Argument fn should be callable")
+        if not callable(key_fn):
+            raise TypeError("Argument key_fn should be callable")
+        if max_size < 1:
+            raise ValueError("Argument max_size should be positive")
+        self.fn = fn
+        self.max_size = max_size
+        self.key_fn = key_fn
+        self.n_hits = 0
+        self.n_misses = 0
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Method to get number of cached results
+        """
+        return len(self._cache)
+
+    @property
+    def stats(self):
+        """Cache statistics
+
+        Returns:
+            (dict) with number of hits, misses, cached results and hit rate
+        """
+        n_calls = self.n_hits + self.n_misses
+        return {
+            "n_hits": self.n_hits,
+            "n_misses": self.n_misses,
+            "size": len(self._cache),
+            "hit_rate": self.n_hits / n_calls if n_calls > 0 else 0.0,
+        }
+
+    def __call__(self, data):
+        key = self.key_fn(data)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.n_hits += 1
+                return self._cache[key]
+            self.n_misses += 1
+
+        result = self.fn(data)
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Method to clear cached results and statistics
+        """
+        with self._lock:
+            self._cache.clear()
+            self.n_hits = 0
+            self.n_misses = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # Cache and lock are not shared between processes
+        state["_cache"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,99 @@
+# -*- coding:utf-8 -*-
+from array import array
+from collections import namedtuple
+
+
+Extent = namedtuple("Extent", ["x", "y", "width", "height"])
+Extent.__doc__ = """Lightweight tile extent record in pixels: x offset, y offset, x extent, y extent.
+It has no instance dictionary and compares equal to the tuple `(x, y, width, height)`.
+"""
+
+# Type code of 32-bit signed integers
+_INT32 = "i" if array("i").itemsize == 4 else "l"
+
+
+class Extents(object):
+    """Container of tile extents stored in a single int32 array, 16 bytes per tile.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling import ConstSizeTiles
+
+            tiles = ConstSizeTiles(image_size=(50000, 50000), tile_size=(256, 256), min_overlapping=15)
+            extents = tiles.get_extents()
+            print("Memory: %i bytes" % extents.nbytes)
+
+            for x, y, width, height in extents:
+                pass
+
+            # As numpy array of shape (n, 4) without a copy
+            arr = np.frombuffer(extents.data, dtype=np.int32).reshape(-1, 4)
+
+    Args:
+        n (int): number of extents to preallocate, all values are zero.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, n=0):
+        if n < 0:
+            raise ValueError("Argument n should be non-negative")
+        self.data = array(_INT32, [0]) * (4 * n)
+
+    @classmethod
+    def from_iterable(cls, extents):
+        """Method to create the container from an iterable of extents `(x, y, width, height)`
+        """
+        res = cls()
+        for extent in extents:
+            if len(extent) != 4:
+                raise ValueError("Extent should be (x, y, width, height), but given {}".format(extent))
+            res.data.extend(extent)
+        return res
+
+    @property
+    def nbytes(self):
+        """Size in bytes of the stored extents
+        """
+        return len(self.data) * self.data.itemsize
+
+    def __len__(self):
+        return len(self.data) // 4
+
+    def _check_index(self, idx):
+        n = len(self)
+        if idx < -n or idx >= n:
+            raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, n))
+        return 4 * (idx % n)
+
+    def __getitem__(self, idx):
+        """Method to get the extent at index `idx` as :class:`Extent` record
+        """
+        i = self._check_index(idx)
+        data = self.data
+        return Extent(data[i], data[i + 1], data[i + 2], data[i + 3])
+
+    def __setitem__(self, idx, extent):
+        i = self._check_index(idx)
+        self.data[i:i + 4] = array(_INT32, extent)
+
+    def view(self, idx):
+        """Method to get the extent at index `idx` as a writable view of 4 int32 values, without copying
+        """
+        i = self._check_index(idx)
+        return memoryview(self.data)[i:i + 4]
+
+    def __iter__(self):
+        data = self.data
+        return map(Extent._make, zip(data[0::4], data[1::4], data[2::4], data[3::4]))
+
+    def __eq__(self, other):
+        return isinstance(other, Extents) and self.data == other.data
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "Extents(n={})".format(len(self))
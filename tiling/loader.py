@@ -0,0 +1,209 @@
+# -*- coding:utf-8 -*-
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import timeit
+
+from tiling import BaseTiles
+
+
+class AdaptiveTileLoader(object):
+    """Class loads tile data ahead of the consumer with a self-tuning number of in-flight reads and prefetch depth.
+
+    Each read latency and each consumer wait time are measured. The number of in-flight reads is adapted AIMD-style:
+
+        - additive increase: when the consumer waits for data and read latency is stable, one more read is allowed
+          in flight,
+        - multiplicative decrease: when read latency grows above the best observed latency by more than a tolerance,
+          storage is considered as congested and the number of in-flight reads is halved.
+
+    Prefetch depth, number of tiles read but not yet consumed plus reads in flight, is twice the number of in-flight
+    reads. Both are bounded by the memory budget, estimated from the size (`nbytes`) of read data.
+    Thus, the same configuration performs well on local NVMe as well as on slow network-like storages.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling import ConstSizeTiles
+            from tiling.loader import AdaptiveTileLoader
+
+            def read_fn(extent, out_size):
+                x, y, width, height = extent
+                return read_data(x, y, width, height, out_width=out_size[0], out_height=out_size[1])
+
+            tiles = ConstSizeTiles(image_size=(50000, 50000), tile_size=(256, 256), min_overlapping=15)
+            loader = AdaptiveTileLoader(tiles, read_fn, max_workers=32, memory_budget=512 * 1024 ** 2)
+
+            for extent, out_size, data in loader:
+                predict(data)
+
+            print(loader.settings)
+
+    Args:
+        tiles (BaseTiles): tiles to load
+        read_fn (callable): function `read_fn(extent, out_size)` returning tile data, called from worker threads
+        min_workers (int): minimal number of in-flight reads
+        max_workers (int): maximal number of in-flight reads and size of the thread pool
+        memory_budget (int, optional): memory budget in bytes for prefetched tile data. It does not apply below
+            `min_workers` tiles.
+        latency_tolerance (float): relative increase of read latency above the best observed one considered as
+            storage congestion
+        wait_threshold (float): consumer wait time in seconds above which the consumer is considered as starving
+    """
+
+    def __init__(
+        self,
+        tiles,
+        read_fn,
+        min_workers=1,
+        max_workers=16,
+        memory_budget=None,
+        latency_tolerance=0.5,
+        wait_threshold=1e-3,
+    ):
+        if not isinstance(tiles, BaseTiles):
+            raise TypeError("Argument tiles should be an instance of BaseTiles")
+        if not callable(read_fn):
+            raise TypeError("Argument read_fn should be callable")
+        if not (1 <= min_workers <= max_workers):
+            raise ValueError(
+                "Arguments min_workers and max_workers should be such that 1 <= min_workers <= max_workers, "
+                "but given {} and {}".format(min_workers, max_workers)
+            )
+        if memory_budget is not None and memory_budget <= 0:
+            raise ValueError("Argument memory_budget should be positive")
+
+        self.tiles = tiles
+        self.read_fn = read_fn
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.memory_budget = memory_budget
+        self.latency_tolerance = latency_tolerance
+        self.wait_threshold = wait_threshold
+
+        self.n_in_flight = min_workers
+        self.prefetch_depth = 2 * min_workers
+        self.latency = None
+        self.min_latency = None
+        self.tile_nbytes = None
+        self.wait_time = 0.0
+        self._lock = threading.RLock()
+
+    @property
+    def settings(self):
+        """Current settings and measurements of the loader
+
+        Returns:
+            (dict) with number of in-flight reads, prefetch depth, smoothed read latency and best observed latency in
+            seconds, total consumer wait time in seconds and estimated tile size in bytes
+        """
+        return {
+            "n_in_flight": self.n_in_flight,
+            "prefetch_depth": self.prefetch_depth,
+            "latency": self.latency,
+            "min_latency": self.min_latency,
+            "wait_time": self.wait_time,
+            "tile_nbytes": self.tile_nbytes,
+        }
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def __iter__(self):
+        """Method to iterate over tiles in order
+
+        Yields:
+            (tuple) tile extent, output size and tile data
+        """
+        state = _LoaderState()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            self._fill(executor, state)
+            for _ in range(len(self.tiles)):
+                with self._lock:
+                    tile, future = state.queue.popleft()
+                start = timeit.default_timer()
+                data = future.result()
+                wait = timeit.default_timer() - start
+                self.wait_time += wait
+                with self._lock:
+                    if self.tile_nbytes is None and hasattr(data, "nbytes"):
+                        self.tile_nbytes = data.nbytes
+                        self._set_in_flight(self.n_in_flight)
+                    self._on_consume(wait, state)
+                self._fill(executor, state)
+                yield tile[0], tile[1], data
+        finally:
+            with self._lock:
+                state.closed = True
+                for _, future in state.queue:
+                    future.cancel()
+            executor.shutdown(wait=True)
+
+    def _read(self, tile, state):
+        start = timeit.default_timer()
+        try:
+            return self.read_fn(tile[0], tile[1])
+        finally:
+            latency = timeit.default_timer() - start
+            with self._lock:
+                state.n_running -= 1
+                self._on_read(latency, state)
+
+    def _fill(self, executor, state):
+        """Method to submit reads up to the current number of in-flight reads and prefetch depth
+        """
+        with self._lock:
+            while not state.closed and state.next_index < len(self.tiles):
+                if state.n_running >= self.n_in_flight or len(state.queue) >= self.prefetch_depth:
+                    break
+                tile = self.tiles[state.next_index]
+                state.next_index += 1
+                state.n_running += 1
+                future = executor.submit(self._read, tile, state)
+                future.add_done_callback(lambda _: self._fill(executor, state))
+                state.queue.append((tile, future))
+
+    def _on_read(self, latency, state):
+        """Method to update latency measurements and to decrease the number of in-flight reads on congestion
+        """
+        state.n_reads += 1
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if self.min_latency is None or self.latency < self.min_latency:
+            self.min_latency = self.latency
+
+        congested = self.latency > self.min_latency * (1.0 + self.latency_tolerance)
+        # Decrease at most once per window of in-flight reads, such that the new setting is measured
+        if congested and state.n_reads - state.last_decrease >= self.n_in_flight:
+            state.last_decrease = state.n_reads
+            self._set_in_flight(max(self.min_workers, self.n_in_flight // 2))
+            # Forget the congested measurements
+            self.latency = self.min_latency
+
+    def _on_consume(self, wait, state):
+        """Method to increase the number of in-flight reads when the consumer waits for data
+        """
+        if wait > self.wait_threshold and self.n_in_flight < self.max_workers:
+            if self.latency is None or self.latency <= self.min_latency * (1.0 + self.latency_tolerance):
+                self._set_in_flight(self.n_in_flight + 1)
+
+    def _set_in_flight(self, n_in_flight):
+        prefetch_depth = 2 * n_in_flight
+        if self.memory_budget is not None and self.tile_nbytes:
+            prefetch_depth = min(prefetch_depth, max(self.memory_budget // self.tile_nbytes, 1))
+            n_in_flight = min(n_in_flight, prefetch_depth)
+        self.n_in_flight = max(min(n_in_flight, self.max_workers), self.min_workers)
+        self.prefetch_depth = max(prefetch_depth, self.n_in_flight)
+
+
+class _LoaderState(object):
+    __slots__ = ("queue", "next_index", "n_running", "n_reads", "last_decrease", "closed")
+
+    def __init__(self):
+        self.queue = deque()
+        self.next_index = 0
+        self.n_running = 0
+        self.n_reads = 0
+        self.last_decrease = 0
+        self.closed = False
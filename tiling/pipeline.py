@@ -0,0 +1,261 @@
+# -*- coding:utf-8 -*-
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class _Skip(object):
+    """Marker of an item dropped by a filter, kept unique when pickled from a process pool
+    """
+
+    __slots__ = ()
+
+    def __reduce__(self):
+        return "_SKIP"
+
+
+_SKIP = _Skip()
+
+
+class _Stage(object):
+    __slots__ = ("kind", "fn", "n_workers", "executor", "buffer_size")
+
+    def __init__(self, kind, fn, n_workers=None, executor="thread", buffer_size=None):
+        self.kind = kind
+        self.fn = fn
+        self.n_workers = n_workers
+        self.executor = executor
+        self.buffer_size = buffer_size
+
+
+class _FusedFunction(object):
+    """Function applying consecutive map, read and filter stages to an item in a single call.
+    It is picklable if stage functions are picklable, such that it can be executed in a process pool.
+    """
+
+    __slots__ = ("ops",)
+
+    def __init__(self, ops):
+        self.ops = ops
+
+    def __call__(self, item):
+        for kind, fn in self.ops:
+            if kind == "map":
+                item = fn(item)
+            elif kind == "read":
+                item = fn(item[0], item[1])
+            elif not fn(item):
+                return _SKIP
+        return item
+
+
+class Pipeline(object):
+    """Class provides a lazy pipeline of stages over tiles or any iterable. Usually created with `tiles.pipe()`.
+
+    Each method returns a new pipeline with an additional stage, nothing is executed until the pipeline is iterated.
+    Items are streamed through stages with bounded buffers. Consecutive `read`, `map` and `filter` stages are fused
+    into a single function call per item, without intermediate generators or containers. A stage with `n_workers`
+    runs, together with the following fused stages, on a thread or process pool, preserving the order of items.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling import ConstSizeTiles
+
+            tiles = ConstSizeTiles(image_size=(50000, 50000), tile_size=(256, 256), min_overlapping=15)
+
+            def read_fn(extent, out_size):
+                x, y, width, height = extent
+                return read_data(x, y, width, height, out_width=out_size[0], out_height=out_size[1])
+
+            pipeline = (
+                tiles.pipe()
+                .read(read_fn, n_workers=8)
+                .filter(lambda data: (data == nodata).mean() < 0.9)
+                .map(normalize)
+                .batch(32)
+            )
+            for batch in pipeline:
+                predict(batch)
+
+    Args:
+        source (iterable): items to process, e.g. tiles yielding `(extent, out_size)`
+    """
+
+    def __init__(self, source, stages=()):
+        self.source = source
+        self.stages = tuple(stages)
+
+    def _add(self, stage):
+        return Pipeline(self.source, self.stages + (stage,))
+
+    @staticmethod
+    def _check_parallel_args(fn, n_workers, executor, buffer_size):
+        if not callable(fn):
+            raise TypeError("Argument fn should be callable")
+        if n_workers is not None and n_workers < 1:
+            raise ValueError("Argument n_workers should be positive")
+        if not (executor in ("thread", "process") or isinstance(executor, Executor)):
+            raise ValueError("Argument executor should be 'thread', 'process' or an instance of Executor")
+        if buffer_size is not None and buffer_size < 1:
+            raise ValueError("Argument buffer_size should be positive")
+
+    def read(self, fn, n_workers=None, executor="thread", buffer_size=None):
+        """Method to add a stage reading tile data: each item `(extent, out_size)` is replaced by
+        `fn(extent, out_size)`
+
+        Args:
+            fn (callable): read function `fn(extent, out_size)`
+            n_workers (int, optional): number of workers running the stage in parallel. If None, the stage runs in
+                the consumer thread.
+            executor (str or Executor): "thread" or "process" pool created for the iteration, or an existing
+                `concurrent.futures.Executor` in which case `n_workers` sets the number of items in flight
+            buffer_size (int, optional): maximal number of items in flight for a parallel stage, by default
+                `2 * n_workers`
+
+        Returns:
+            (Pipeline) new pipeline
+        """
+        Pipeline._check_parallel_args(fn, n_workers, executor, buffer_size)
+        return self._add(_Stage("read", fn, n_workers, executor, buffer_size))
+
+    def map(self, fn, n_workers=None, executor="thread", buffer_size=None):
+        """Method to add a stage replacing each item by `fn(item)`
+
+        Args:
+            fn (callable): function applied on each item
+            n_workers (int, optional): number of workers running the stage in parallel, see :meth:`read`
+            executor (str or Executor): executor for a parallel stage, see :meth:`read`
+            buffer_size (int, optional): maximal number of items in flight for a parallel stage, see :meth:`read`
+
+        Returns:
+            (Pipeline) new pipeline
+        """
+        Pipeline._check_parallel_args(fn, n_workers, executor, buffer_size)
+        return self._add(_Stage("map", fn, n_workers, executor, buffer_size))
+
+    def filter(self, pred):
+        """Method to add a stage keeping only items for which `pred(item)` is true
+
+        Args:
+            pred (callable): predicate applied on each item
+
+        Returns:
+            (Pipeline) new pipeline
+        """
+        if not callable(pred):
+            raise TypeError("Argument pred should be callable")
+        return self._add(_Stage("filter", pred))
+
+    def dedup(self, fn, max_size=128, n_workers=None, executor="thread", buffer_size=None):
+        """Method to add a stage replacing each item by `fn(item)`, computed once per unique item content and replayed
+        from a LRU cache for duplicated items, see :class:`tiling.dedup.Deduplicator`. To get cache statistics, pass a
+        `Deduplicator` instance as `fn`. With a process pool, each process has its own cache.
+
+        Args:
+            fn (callable or Deduplicator): function applied on each unique item content
+            max_size (int): maximal number of cached results, if `fn` is not a `Deduplicator`
+            n_workers (int, optional): number of workers running the stage in parallel, see :meth:`read`
+            executor (str or Executor): executor for a parallel stage, see :meth:`read`
+            buffer_size (int, optional): maximal number of items in flight for a parallel stage, see :meth:`read`
+
+        Returns:
+            (Pipeline) new pipeline
+        """
+        from tiling.dedup import Deduplicator
+
+        if not isinstance(fn, Deduplicator):
+            fn = Deduplicator(fn, max_size=max_size)
+        return self.map(fn, n_workers=n_workers, executor=executor, buffer_size=buffer_size)
+
+    def batch(self, batch_size, drop_last=False):
+        """Method to add a stage grouping items into lists of `batch_size` items
+
+        Args:
+            batch_size (int): number of items per batch
+            drop_last (bool): if True, the last incomplete batch is dropped
+
+        Returns:
+            (Pipeline) new pipeline
+        """
+        if batch_size < 1:
+            raise ValueError("Argument batch_size should be positive")
+        return self._add(_Stage("batch", (batch_size, drop_last)))
+
+    def _get_segments(self):
+        """Method to group stages into segments executed as a whole: fused functions (with optional parallel
+        execution) and batches
+        """
+        segments = []
+        for stage in self.stages:
+            if stage.kind == "batch":
+                segments.append(("batch", stage.fn, None))
+            elif stage.n_workers is not None or not segments or segments[-1][0] != "fused":
+                segments.append(("fused", [(stage.kind, stage.fn)], stage))
+            else:
+                segments[-1][1].append((stage.kind, stage.fn))
+        return segments
+
+    def __iter__(self):
+        it = iter(self.source)
+        generators = []
+        executors = []
+        try:
+            for kind, value, stage in self._get_segments():
+                if kind == "batch":
+                    it = _batch(it, *value)
+                elif stage.n_workers is None:
+                    it = _apply(it, _FusedFunction(value))
+                else:
+                    executor = stage.executor
+                    if not isinstance(executor, Executor):
+                        pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+                        executor = pool_cls(max_workers=stage.n_workers)
+                        executors.append(executor)
+                    buffer_size = stage.buffer_size if stage.buffer_size is not None else 2 * stage.n_workers
+                    it = _apply_parallel(it, _FusedFunction(value), executor, buffer_size)
+                generators.append(it)
+            for item in it:
+                yield item
+        finally:
+            # Stop stages from the last one, such that parallel stages cancel their pending items before shutdown
+            for generator in reversed(generators):
+                generator.close()
+            for executor in executors:
+                executor.shutdown(wait=True)
+
+
+def _apply(it, fn):
+    for item in it:
+        item = fn(item)
+        if item is not _SKIP:
+            yield item
+
+
+def _apply_parallel(it, fn, executor, buffer_size):
+    futures = deque()
+    try:
+        for item in it:
+            futures.append(executor.submit(fn, item))
+            if len(futures) >= buffer_size:
+                item = futures.popleft().result()
+                if item is not _SKIP:
+                    yield item
+        while futures:
+            item = futures.popleft().result()
+            if item is not _SKIP:
+                yield item
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _batch(it, batch_size, drop_last):
+    batch = []
+    for item in it:
+        batch.append(item)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch and not drop_last:
+        yield batch
@@ -0,0 +1,278 @@
+# -*- coding:utf-8 -*-
+import math
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+from tiling import ceil_int
+from tiling.const_size import ConstSizeTiles
+from tiling.const_stride import ConstStrideTiles
+
+
+class TilingPlan(object):
+    """Class describes a tiling configuration and its analytical costs. See :meth:`plan_tiles`.
+
+    Attributes:
+        tiles (BaseTiles): configured tiles, either `ConstStrideTiles` or `ConstSizeTiles`
+        batch_size (int): number of tiles per batch fitting into the memory budget
+        n_tiles (int): number of tiles
+        read_pixels (int): number of image pixels read, aligned on native blocks if block size is given
+        read_amplification (float): ratio between read pixels and image pixels
+        padded_fraction (float): fraction of nodata pixels in the processed tiles
+        peak_memory (int): peak buffer memory in bytes
+        cost (float): total cost used to rank configurations
+    """
+
+    __slots__ = (
+        "tiles",
+        "batch_size",
+        "n_tiles",
+        "read_pixels",
+        "read_amplification",
+        "padded_fraction",
+        "peak_memory",
+        "cost",
+    )
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs[name])
+
+    def __repr__(self):
+        tiles = self.tiles
+        if isinstance(tiles, ConstStrideTiles):
+            params = "stride={}, origin={}".format(tiles.stride, tiles.origin)
+        else:
+            params = "min_overlapping={}".format(tiles.min_overlapping)
+        return (
+            "TilingPlan({}(tile_size={}, {}, scale={}), batch_size={}, n_tiles={}, read_amplification={:.3f}, "
+            "padded_fraction={:.3f}, peak_memory={}, cost={:.4g})".format(
+                type(tiles).__name__,
+                tuple(tiles.tile_size),
+                params,
+                tiles.scale,
+                self.batch_size,
+                self.n_tiles,
+                self.read_amplification,
+                self.padded_fraction,
+                self.peak_memory,
+                self.cost,
+            )
+        )
+
+
+def plan_tiles(image_size, memory_budget, margin=0, bytes_per_pixel=4, block_size=None, **kwargs):
+    """Method to choose the cheapest valid tiling configuration under memory and I/O budgets.
+
+    Candidate grids of `ConstStrideTiles` and `ConstSizeTiles` are evaluated analytically, without enumerating tiles.
+    Neighbour tiles overlap by `2 * margin` such that each pixel is at least at `margin` from a tile boundary in
+    one of the tiles. Total cost is
+
+    .. code-block:: text
+
+        cost = read_cost * read_pixels + compute_cost * processed_pixels + tile_cost * n_tiles
+
+    where `read_pixels` are image pixels read (aligned on native blocks if `block_size` is given) and
+    `processed_pixels` are output pixels of all tiles, including nodata.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling.planner import plan_tiles
+
+            plan = plan_tiles(image_size=(50000, 40000), memory_budget=2 * 1024 ** 3, margin=16,
+                              bytes_per_pixel=3 * 4, block_size=(512, 512))
+            print(plan)
+            for extent, out_size in plan.tiles:
+                pass
+
+    Args:
+        image_size (list/tuple of int): input image size in pixels (width, height)
+        memory_budget (int): memory budget in bytes for tile buffers. A tile in a buffer holds both read data (tile
+            extent) and output data (tile size).
+        margin (int): model receptive-field margin in tile pixels
+        bytes_per_pixel (int): bytes per pixel of tile buffers, including all channels
+        block_size (int or list/tuple of int, optional): native block size of the image storage (width, height)
+        **kwargs: other options of :meth:`get_tiling_plans`
+
+    Returns:
+        (TilingPlan) the cheapest configuration
+    """
+    plans = get_tiling_plans(image_size, memory_budget, margin, bytes_per_pixel, block_size, **kwargs)
+    if len(plans) == 0:
+        raise ValueError(
+            "No valid tiling configuration for image size {} with memory budget {} bytes".format(
+                image_size, memory_budget
+            )
+        )
+    return plans[0]
+
+
+def get_tiling_plans(
+    image_size,
+    memory_budget,
+    margin=0,
+    bytes_per_pixel=4,
+    block_size=None,
+    tile_sizes=None,
+    scale=1.0,
+    max_batch_size=64,
+    n_buffers=2,
+    read_cost=1.0,
+    compute_cost=1.0,
+    tile_cost=0.0,
+):
+    """Method to evaluate candidate tiling configurations, see :meth:`plan_tiles`.
+
+    Args:
+        image_size (list/tuple of int): input image size in pixels (width, height)
+        memory_budget (int): memory budget in bytes for tile buffers. A tile in a buffer holds both read data (tile
+            extent) and output data (tile size).
+        margin (int): model receptive-field margin in tile pixels
+        bytes_per_pixel (int): bytes per pixel of tile buffers, including all channels
+        block_size (int or list/tuple of int, optional): native block size of the image storage (width, height)
+        tile_sizes (list of int, optional): candidate square tile sizes. By default, multiples of the block size
+            if given, otherwise sizes between 32 and 8192 growing by a factor sqrt(2), rounded to 16.
+        scale (float): tile scaling factor
+        max_batch_size (int): maximal number of tiles per batch
+        n_buffers (int): number of batch buffers alive at the same time, e.g. 2 for double buffering
+        read_cost (float): cost of reading an image pixel
+        compute_cost (float): cost of processing a tile pixel
+        tile_cost (float): fixed cost per tile, e.g. per-request latency
+
+    Returns:
+        (list) of valid :class:`TilingPlan`, sorted by increasing cost
+    """
+    if not (isinstance(image_size, Sequence) and len(image_size) == 2):
+        raise TypeError("Argument image_size should be (sx, sy)")
+    if memory_budget <= 0:
+        raise ValueError("Argument memory_budget should be positive")
+    if margin < 0:
+        raise ValueError("Argument margin should be non-negative")
+    if block_size is not None:
+        if not (isinstance(block_size, int) or (isinstance(block_size, Sequence) and len(block_size) == 2)):
+            raise TypeError("Argument block_size should be either int or pair of integers (sx, sy)")
+        if isinstance(block_size, int):
+            block_size = (block_size, block_size)
+        for s in block_size:
+            if s < 1:
+                raise ValueError("Values of block_size should be positive")
+
+    if tile_sizes is None:
+        if block_size is not None:
+            base = max(block_size)
+            tile_sizes = [base * k for k in range(1, max(8192 // base, 1) + 1)]
+            tile_sizes += [base // k for k in (2, 4, 8) if base // k >= 32]
+        else:
+            tile_sizes = [int(2 ** (k / 2.0)) // 16 * 16 for k in range(10, 27)]
+        tile_sizes = sorted(set(tile_sizes))
+
+    plans = []
+    for tile_size in tile_sizes:
+        for tiles in _get_candidate_tiles(image_size, tile_size, margin, scale):
+            plan = _evaluate(
+                tiles,
+                memory_budget,
+                bytes_per_pixel,
+                block_size,
+                max_batch_size,
+                n_buffers,
+                read_cost,
+                compute_cost,
+                tile_cost,
+            )
+            if plan is not None:
+                plans.append(plan)
+    plans.sort(key=lambda p: p.cost)
+    return plans
+
+
+def _get_candidate_tiles(image_size, tile_size, margin, scale):
+    """Method to get candidate tiles for a tile size, such that neighbour tiles overlap by 2 * margin
+    """
+    if tile_size <= 2 * margin:
+        return []
+    res = []
+    # Constant stride, tiles start at -margin to have margin context at boundaries, nodata is padded
+    origin = -ceil_int(margin / scale)
+    try:
+        res.append(
+            ConstStrideTiles(
+                image_size,
+                tile_size,
+                stride=tile_size - 2 * margin,
+                scale=scale,
+                origin=(origin, origin),
+                include_nodata=True,
+            )
+        )
+    except ValueError:
+        pass
+    # Constant size, tiles are inside the image without nodata
+    try:
+        res.append(ConstSizeTiles(image_size, tile_size, min_overlapping=ceil_int(2 * margin / scale), scale=scale))
+    except ValueError:
+        pass
+    return res
+
+
+def _get_axis_read_lengths(axis_tiles, size, block):
+    """Method to compute lengths of image parts read by tiles along an axis, aligned on blocks if given
+    """
+    res = []
+    for offset, extent, _ in axis_tiles:
+        start = max(offset, 0)
+        end = min(offset + extent, size)
+        if end <= start:
+            res.append(0)
+            continue
+        if block is not None:
+            start = (start // block) * block
+            end = min(int(math.ceil(end * 1.0 / block)) * block, size)
+        res.append(end - start)
+    return res
+
+
+def _evaluate(
+    tiles, memory_budget, bytes_per_pixel, block_size, max_batch_size, n_buffers, read_cost, compute_cost, tile_cost
+):
+    """Method to compute analytical costs of the tiles. Returns None if tiles do not fit into the memory budget
+    """
+    # Buffers hold both read data (extent) and output data (tile size)
+    tile_memory = (
+        tiles.tile_size[0] * tiles.tile_size[1] + tiles.tile_extent[0] * tiles.tile_extent[1]
+    ) * bytes_per_pixel
+    batch_size = min(max_batch_size, memory_budget // (tile_memory * n_buffers))
+    if batch_size < 1:
+        return None
+
+    n_tiles = len(tiles)
+    x_tiles = tiles.get_axis_tiles(0)
+    y_tiles = tiles.get_axis_tiles(1)
+    width, height = tiles.image_size
+    x_read = _get_axis_read_lengths(x_tiles, width, None if block_size is None else block_size[0])
+    y_read = _get_axis_read_lengths(y_tiles, height, None if block_size is None else block_size[1])
+    read_pixels = sum(x_read) * sum(y_read)
+
+    x_valid = _get_axis_read_lengths(x_tiles, width, None)
+    y_valid = _get_axis_read_lengths(y_tiles, height, None)
+    x_extent = [extent for _, extent, _ in x_tiles]
+    y_extent = [extent for _, extent, _ in y_tiles]
+    valid_pixels = sum(x_valid) * sum(y_valid)
+    extent_pixels = sum(x_extent) * sum(y_extent)
+
+    processed_pixels = n_tiles * tiles.tile_size[0] * tiles.tile_size[1]
+    image_pixels = tiles.image_size[0] * tiles.image_size[1]
+    return TilingPlan(
+        tiles=tiles,
+        batch_size=int(batch_size),
+        n_tiles=n_tiles,
+        read_pixels=read_pixels,
+        read_amplification=read_pixels * 1.0 / image_pixels,
+        padded_fraction=1.0 - valid_pixels * 1.0 / extent_pixels,
+        peak_memory=int(batch_size * tile_memory * n_buffers),
+        cost=read_cost * read_pixels + compute_cost * processed_pixels + tile_cost * n_tiles,
+    )
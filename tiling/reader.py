@@ -0,0 +1,132 @@
+# -*- coding:utf-8 -*-
+from contextlib import contextmanager
+import threading
+
+
+class _Entry(object):
+    __slots__ = ("ready", "data", "error", "count")
+
+    def __init__(self, ready):
+        self.ready = ready
+        self.data = None
+        self.error = None
+        self.count = 1
+
+
+def _get_key(extent, out_size):
+    return tuple(extent), tuple(out_size)
+
+
+class SharedReader(object):
+    """Class provides a thread-safe shared front-end to a tile reader for concurrent consumers of the same tiles.
+
+    Requests of the same `(extent, out_size)` are deduplicated while in flight or held by a consumer (single-flight):
+    only the first consumer calls `read_fn`, others wait and get the same result. The result is freed when the last
+    consumer releases it. If the read fails, the error is raised to all waiting consumers which should not release
+    the tile.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling import ConstSizeTiles
+            from tiling.reader import SharedReader
+
+            def read_fn(extent, out_size):
+                x, y, width, height = extent
+                return read_data(x, y, width, height, out_width=out_size[0], out_height=out_size[1])
+
+            reader = SharedReader(read_fn)
+
+            # in each of the model heads running concurrently:
+            for extent, out_size in tiles:
+                with reader.read(extent, out_size) as data:
+                    predict(data)
+
+    Args:
+        read_fn (callable): function `read_fn(extent, out_size)` returning tile data
+    """
+
+    def __init__(self, read_fn):
+        if not callable(read_fn):
+            raise TypeError("Argument read_fn should be callable")
+        self.read_fn = read_fn
+        self.n_reads = 0
+        self.n_shared = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Method to get number of tiles in flight or held by consumers
+        """
+        return len(self._entries)
+
+    def acquire(self, extent, out_size):
+        """Method to get tile data, reading it only if it is not already in flight or held by another consumer.
+        Each call should be paired with :meth:`release`.
+
+        Args:
+            extent (list/tuple of int): tile extent in pixels: x, y, width, height
+            out_size (list/tuple of int): tile output size in pixels: width, height
+
+        Returns:
+            tile data returned by `read_fn`
+        """
+        key = _get_key(extent, out_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.count += 1
+                self.n_shared += 1
+                owner = False
+            else:
+                entry = _Entry(threading.Event())
+                self._entries[key] = entry
+                self.n_reads += 1
+                owner = True
+
+        if owner:
+            try:
+                entry.data = self.read_fn(extent, out_size)
+            except BaseException as e:
+                entry.error = e
+                # Failed read is not shared with further requests, they will retry
+                with self._lock:
+                    del self._entries[key]
+            entry.ready.set()
+        else:
+            entry.ready.wait()
+
+        if entry.error is not None:
+            raise entry.error
+        return entry.data
+
+    def release(self, extent, out_size):
+        """Method to release tile data acquired with :meth:`acquire`. Data is freed when the last consumer releases it.
+
+        Args:
+            extent (list/tuple of int): tile extent in pixels: x, y, width, height
+            out_size (list/tuple of int): tile output size in pixels: width, height
+        """
+        key = _get_key(extent, out_size)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                raise KeyError("Tile {} is not acquired".format(key))
+            entry.count -= 1
+            if entry.count == 0:
+                del self._entries[key]
+
+    @contextmanager
+    def read(self, extent, out_size):
+        """Method to acquire tile data in a `with` statement, data is released at exit
+
+        Args:
+            extent (list/tuple of int): tile extent in pixels: x, y, width, height
+            out_size (list/tuple of int): tile output size in pixels: width, height
+        """
+        data = self.acquire(extent, out_size)
+        try:
+            yield data
+        finally:
+            self.release(extent, out_size)
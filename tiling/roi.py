@@ -0,0 +1,253 @@
+# -*- coding:utf-8 -*-
+from array import array
+from bisect import bisect_left, bisect_right
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+from tiling import BaseTiles
+from tiling.extents import Extents
+
+
+class RoiTiles(BaseTiles):
+    """Class restricts tiles to the ones intersecting a region of interest (ROI), e.g. a field boundary or an AOI
+    polygon inside a huge scene.
+
+    ROI is rasterized at grid resolution: polygon edges are traversed over the tiles they cross and the interior is
+    filled with a scanline, row by row of tiles. Thus, the cost depends on the number of polygon vertices and
+    the number of selected tiles, not on the total number of tiles.
+
+    Selected tiles can be used as any tiles, e.g. with a tile loader, a pipeline or a tile writer. Core regions are the
+    ones of the restricted tiles, thus selected tiles are stitched without overlapping.
+
+    Examples:
+
+        .. code-block:: python
+
+            from tiling import ConstSizeTiles, RoiTiles
+
+            tiles = ConstSizeTiles(image_size=(50000, 50000), tile_size=(256, 256), min_overlapping=15)
+            roi_tiles = RoiTiles(tiles, roi=[(1000, 1000), (5000, 1200), (3000, 4000)])
+
+            print("Number of tiles: %i / %i" % (len(roi_tiles), len(tiles)))
+            for i, (extent, out_size) in enumerate(roi_tiles):
+                idx = roi_tiles.indices[i]  # index of the tile in `tiles`
+                x, y, width, height = extent
+                data = read_data(x, y, width, height,
+                                 out_width=out_size[0],
+                                 out_height=out_size[1])
+
+    Args:
+        tiles (BaseTiles): tiles to restrict
+        roi (list/tuple): region of interest in pixels of the original image, either a polygon as a list of points
+            `(x, y)` or a list of rectangles `(x, y, width, height)`.
+    """
+
+    def __init__(self, tiles, roi):
+        if not isinstance(tiles, BaseTiles):
+            raise TypeError("Argument tiles should be an instance of BaseTiles")
+        if isinstance(tiles, RoiTiles):
+            raise TypeError("Argument tiles should not be an instance of RoiTiles, use the restricted tiles instead")
+        super(RoiTiles, self).__init__(tiles.image_size, tiles.tile_size, tiles.scale)
+
+        polygons = RoiTiles._get_polygons(roi)
+
+        x_tiles = tiles.get_axis_tiles(0)
+        y_tiles = tiles.get_axis_tiles(1)
+        x_starts = [offset for offset, _, _ in x_tiles]
+        x_ends = [offset + extent for offset, extent, _ in x_tiles]
+        y_starts = [offset for offset, _, _ in y_tiles]
+        y_ends = [offset + extent for offset, extent, _ in y_tiles]
+
+        # Selected column ranges per row of tiles
+        rows = {}
+        for polygon in polygons:
+            RoiTiles._rasterize_edges(polygon, x_starts, x_ends, y_starts, y_ends, rows)
+            RoiTiles._rasterize_interior(polygon, x_starts, x_ends, y_starts, y_ends, rows)
+
+        # Boundary tiles can have an empty extent, e.g. with a negative origin and without nodata, and are skipped
+        empty_columns = any(end <= start for start, end in zip(x_starts, x_ends))
+        indices = array("l")
+        for j in sorted(rows.keys()):
+            if y_ends[j] <= y_starts[j]:
+                continue
+            offset = j * tiles.nx
+            for c0, c1 in RoiTiles._merge_ranges(rows[j]):
+                if empty_columns:
+                    indices.extend(offset + c for c in range(c0, c1) if x_ends[c] > x_starts[c])
+                else:
+                    indices.extend(range(offset + c0, offset + c1))
+
+        self.tiles = tiles
+        self.roi = polygons
+        self.indices = indices
+        self._max_index = len(indices)
+
+    def __len__(self):
+        """Method to get number of tiles intersecting the ROI
+        """
+        return len(self.indices)
+
+    def __getitem__(self, idx):
+        """Method to get the tile at index `idx` among the tiles intersecting the ROI
+
+        Args:
+            idx: (int) tile index between `0` and `len(roi_tiles)`
+
+        Returns:
+            (tuple) tile extent, output size in pixels, as `tiles[roi_tiles.indices[idx]]`
+        """
+        if idx < -len(self) or idx >= len(self):
+            raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, len(self)))
+        return self.tiles[self.indices[idx]]
+
+    def __iter__(self):
+        tiles = self.tiles
+        for idx in self.indices:
+            yield tiles[idx]
+
+    def get_extent(self, idx, out=None):
+        """Method to get only the extent of the tile at index `idx`, see :meth:`BaseTiles.get_extent`
+        """
+        if idx < -len(self) or idx >= len(self):
+            raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, len(self)))
+        return self.tiles.get_extent(self.indices[idx], out=out)
+
+    def get_extents(self, out=None):
+        """Method to get extents of the tiles intersecting the ROI, see :meth:`BaseTiles.get_extents`
+        """
+        if out is None:
+            out = Extents(len(self))
+        elif len(out) != len(self):
+            raise ValueError("Argument out should contain {} extents, but has {}".format(len(self), len(out)))
+        for i, idx in enumerate(self.indices):
+            self.tiles.get_extent(idx, out=out.view(i))
+        return out
+
+    def get_axis_tiles(self, axis, indices=None):
+        """Tiles intersecting the ROI are not a grid, see `roi_tiles.tiles.get_axis_tiles`
+        """
+        raise NotImplementedError("Tiles intersecting a ROI are not a grid, use get_axis_tiles of restricted tiles")
+
+    def get_core_extent(self, idx):
+        """Method to get the core region of the tile at index `idx`, as the core region of the restricted tile.
+        See :meth:`BaseTiles.get_core_extent`.
+        """
+        if idx < -len(self) or idx >= len(self):
+            raise IndexError("Index %i is out of ranges %i and %i" % (idx, 0, len(self)))
+        return self.tiles.get_core_extent(self.indices[idx])
+
+    def get_core_extents(self):
+        """Method to get core regions of the tiles intersecting the ROI, see :meth:`get_core_extent`
+        """
+        core_extents = self.tiles.get_core_extents()
+        return [core_extents[idx] for idx in self.indices]
+
+    def __contains__(self, idx):
+        """Method to check if the tile of index `idx` in `tiles` intersects the ROI
+        """
+        i = bisect_left(self.indices, idx)
+        return i < len(self.indices) and self.indices[i] == idx
+
+    @staticmethod
+    def _get_polygons(roi):
+        """Method to convert ROI into a list of polygons
+        """
+        if not (isinstance(roi, Sequence) and len(roi) > 0 and all(isinstance(p, Sequence) for p in roi)):
+            raise TypeError("Argument roi should be a list of points (x, y) or a list of rectangles (x, y, w, h)")
+
+        if all(len(p) == 2 for p in roi):
+            if len(roi) < 3:
+                raise ValueError("Polygon should have at least 3 points")
+            return [[(float(x), float(y)) for x, y in roi]]
+
+        if all(len(p) == 4 for p in roi):
+            polygons = []
+            for x, y, w, h in roi:
+                if w <= 0 or h <= 0:
+                    raise ValueError("Rectangle width and height should be positive, but given {}".format((w, h)))
+                x, y, w, h = float(x), float(y), float(w), float(h)
+                polygons.append([(x, y), (x + w, y), (x + w, y + h), (x, y + h)])
+            return polygons
+
+        raise TypeError("Argument roi should be a list of points (x, y) or a list of rectangles (x, y, w, h)")
+
+    @staticmethod
+    def _get_range(starts, ends, low, high):
+        """Method to get the range of tiles along an axis whose interior intersects `[low, high]`
+        """
+        # Tile starts and ends are non-decreasing with the index
+        return bisect_right(ends, low), bisect_left(starts, high)
+
+    @staticmethod
+    def _rasterize_edges(polygon, x_starts, x_ends, y_starts, y_ends, rows):
+        """Method to select tiles crossed by the polygon edges
+        """
+        n = len(polygon)
+        for k in range(n):
+            (xa, ya), (xb, yb) = polygon[k], polygon[(k + 1) % n]
+            if xa > xb:
+                xa, ya, xb, yb = xb, yb, xa, ya
+            c_from, c_to = RoiTiles._get_range(x_starts, x_ends, xa, xb)
+            for c in range(c_from, c_to):
+                # Clip the edge to the column of tiles
+                if xb > xa:
+                    t0 = min(max((x_starts[c] - xa) / (xb - xa), 0.0), 1.0)
+                    t1 = min(max((x_ends[c] - xa) / (xb - xa), 0.0), 1.0)
+                    y0, y1 = ya + t0 * (yb - ya), ya + t1 * (yb - ya)
+                else:
+                    y0, y1 = ya, yb
+                r_from, r_to = RoiTiles._get_range(y_starts, y_ends, min(y0, y1), max(y0, y1))
+                for r in range(r_from, r_to):
+                    rows.setdefault(r, []).append((c, c + 1))
+
+    @staticmethod
+    def _rasterize_interior(polygon, x_starts, x_ends, y_starts, y_ends, rows):
+        """Method to select tiles inside the polygon with a scanline fill at the centre of each row of tiles
+        """
+        n = len(polygon)
+        # Edges as (y min, y max, x at y min, dx / dy), sorted by y min. Horizontal edges do not cross scanlines
+        edges = []
+        for k in range(n):
+            (xa, ya), (xb, yb) = polygon[k], polygon[(k + 1) % n]
+            if ya == yb:
+                continue
+            if ya > yb:
+                xa, ya, xb, yb = xb, yb, xa, ya
+            edges.append((ya, yb, xa, (xb - xa) / (yb - ya)))
+        edges.sort()
+
+        y_min = min(p[1] for p in polygon)
+        y_max = max(p[1] for p in polygon)
+        r_from, r_to = RoiTiles._get_range(y_starts, y_ends, y_min, y_max)
+        active = []
+        next_edge = 0
+        for r in range(r_from, r_to):
+            y = (y_starts[r] + y_ends[r]) * 0.5
+            # Update active edges crossing the scanline, edge is active for y in [y min, y max)
+            while next_edge < len(edges) and edges[next_edge][0] <= y:
+                active.append(edges[next_edge])
+                next_edge += 1
+            active = [e for e in active if e[1] > y]
+
+            # Even-odd rule
+            xs = sorted(e[2] + (y - e[0]) * e[3] for e in active)
+            for i in range(0, len(xs) - 1, 2):
+                if xs[i + 1] > xs[i]:
+                    c_from, c_to = RoiTiles._get_range(x_starts, x_ends, xs[i], xs[i + 1])
+                    if c_to > c_from:
+                        rows.setdefault(r, []).append((c_from, c_to))
+
+    @staticmethod
+    def _merge_ranges(ranges):
+        """Method to merge half-open ranges into sorted disjoint ranges
+        """
+        res = []
+        for start, end in sorted(ranges):
+            if res and start <= res[-1][1]:
+                res[-1] = (res[-1][0], max(res[-1][1], end))
+            else:
+                res.append((start, end))
+        return res
@@ -0,0 +1,197 @@
+# -*- coding:utf-8 -*-
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+import numpy as np
+
+
+class TileWriter(object):
+    """Class writes tile data into an output mosaic, e.g. `np.memmap` or a chunked on-disk array (zarr, h5py, ...).
+
+    Tile data is keyed on the tile extent in the original image and is placed into the output mosaic with respect to
+    the scale: a tile of extent `(x, y, width, height)` and output size `(out_width, out_height)` is written at
+    `(round(x * scale), round(y * scale))` in the output. Parts of the tile outside of the output are dropped.
+
+    Writes can be coalesced into aligned blocks: a block is kept in memory until it is fully covered and is then
+    written at once into the output. This is useful for chunked storages where partial chunk writes are expensive.
+
+    Optionally, overlapping tiles can be cropped to their core region: each output pixel is written only by the tile
+    whose centre is the nearest, thus no accumulation buffer is needed.
+
+    Examples:
+
+        .. code-block:: python
+
+            import numpy as np
+            from tiling import ConstStrideTiles
+            from tiling.writer import TileWriter
+
+            tiles = ConstStrideTiles(image_size=(500, 500), tile_size=(256, 256), stride=(100, 100))
+            output = np.memmap("output.dat", dtype=np.float32, mode="w+", shape=(500, 500))
+
+            with TileWriter(output, tiles=tiles, crop_core=True, block_size=(256, 256)) as writer:
+                for idx, (extent, out_size) in enumerate(tiles):
+                    x, y, width, height = extent
+                    data = read_data(x, y, width, height, out_width=out_size[0], out_height=out_size[1])
+                    writer.write_tile(idx, predict(data))
+
+    Args:
+        output: output array of shape `(height, width, ...)`, supporting slice assignment, e.g. `np.ndarray`,
+            `np.memmap`, `zarr.Array`, `h5py.Dataset`.
+        scale (float): scale between the original image and the output. If `tiles` is provided, the default is the
+            tiles scale.
+        block_size (int or list/tuple of int, optional): size in pixels (width, height) of aligned blocks used to
+            coalesce writes. If None, output `chunks` attribute is used if present, otherwise data is written directly.
+        tiles (BaseTiles, optional): tiles used to produce tile data, required by :meth:`write_tile`.
+        crop_core (bool): if True, :meth:`write_tile` writes only the core region of the tiles.
+    """
+
+    def __init__(self, output, scale=None, block_size=None, tiles=None, crop_core=False):
+        if len(output.shape) < 2:
+            raise TypeError("Argument output should be an array of shape (height, width, ...)")
+
+        if scale is None:
+            scale = tiles.scale if tiles is not None else 1.0
+        if scale <= 0:
+            raise ValueError("Argument scale should be positive")
+
+        if crop_core and tiles is None:
+            raise ValueError("Argument tiles should be provided if crop_core is True")
+
+        if block_size is None:
+            chunks = getattr(output, "chunks", None)
+            if chunks is not None:
+                block_size = (chunks[1], chunks[0])
+        if block_size is not None:
+            if not (isinstance(block_size, int) or (isinstance(block_size, Sequence) and len(block_size) == 2)):
+                raise TypeError("Argument block_size should be either int or pair of integers (sx, sy)")
+            if isinstance(block_size, int):
+                block_size = (block_size, block_size)
+            for s in block_size:
+                if s < 1:
+                    raise ValueError("Values of block_size should be positive")
+            block_size = tuple(block_size)
+
+        self.output = output
+        self.scale = float(scale)
+        self.block_size = block_size
+        self.tiles = tiles
+        self.crop_core = crop_core
+        # Pending blocks: (bx, by) -> [buffer, mask, number of covered pixels]
+        self._blocks = {}
+
+    def write(self, extent, out_size, data, core=None):
+        """Method to write tile data
+
+        Args:
+            extent (list/tuple of int): tile extent in the original image, in pixels: x, y, width, height
+            out_size (list/tuple of int): tile output size in pixels: width, height
+            data (ndarray): tile data of shape `(out_size[1], out_size[0], ...)`
+            core (list/tuple of int, optional): region of the tile to write, in the original image, in pixels:
+                x, y, width, height. If None, the whole tile is written.
+        """
+        data = np.asarray(data)
+        if data.shape[:2] != (out_size[1], out_size[0]):
+            raise ValueError(
+                "Tile data shape {} does not correspond to output size {}".format(data.shape, tuple(out_size))
+            )
+        if core is None:
+            core = extent
+
+        src_x, dst_x = self._map_extent(extent[0], out_size[0], core[0], core[2], self.output.shape[1])
+        src_y, dst_y = self._map_extent(extent[1], out_size[1], core[1], core[3], self.output.shape[0])
+        if dst_x[1] <= dst_x[0] or dst_y[1] <= dst_y[0]:
+            return
+
+        data = data[src_y[0]:src_y[1], src_x[0]:src_x[1]]
+        if self.block_size is None:
+            self.output[dst_y[0]:dst_y[1], dst_x[0]:dst_x[1]] = data
+        else:
+            self._write_blocks(dst_x, dst_y, data)
+
+    def write_tile(self, idx, data):
+        """Method to write data of the tile at index `idx`
+
+        Args:
+            idx (int): tile index
+            data (ndarray): tile data of shape `(out_size[1], out_size[0], ...)` with `out_size` from `tiles[idx]`
+        """
+        if self.tiles is None:
+            raise RuntimeError("Tiles should be provided to write tile by index")
+        extent, out_size = self.tiles[idx]
+        core = self.tiles.get_core_extent(idx)[0] if self.crop_core else None
+        self.write(extent, out_size, data, core=core)
+
+    def flush(self):
+        """Method to write all pending blocks into the output. Pixels which were not written are kept unchanged.
+        """
+        for key in list(self._blocks.keys()):
+            self._flush_block(key)
+        if hasattr(self.output, "flush"):
+            self.output.flush()
+
+    def close(self):
+        """Method to flush pending blocks
+        """
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _map_extent(self, offset, out_size, core_offset, core_extent, output_size):
+        """Method to map a core region of a tile along one axis into tile data and output coordinates
+        """
+        # Tile data starts at round(offset * scale) in the output, core bounds are mapped independently of the tile
+        # such that the cores of neighbour tiles do not overlap in the output
+        tile_start = int(round(offset * self.scale))
+        dst_start = max(int(round(core_offset * self.scale)), tile_start, 0)
+        dst_end = min(int(round((core_offset + core_extent) * self.scale)), tile_start + out_size, output_size)
+        dst_end = max(dst_end, dst_start)
+        return (dst_start - tile_start, dst_end - tile_start), (dst_start, dst_end)
+
+    def _block_bounds(self, key):
+        bx, by = key
+        x0, y0 = bx * self.block_size[0], by * self.block_size[1]
+        x1 = min(x0 + self.block_size[0], self.output.shape[1])
+        y1 = min(y0 + self.block_size[1], self.output.shape[0])
+        return x0, y0, x1, y1
+
+    def _write_blocks(self, dst_x, dst_y, data):
+        bw, bh = self.block_size
+        for by in range(dst_y[0] // bh, (dst_y[1] - 1) // bh + 1):
+            for bx in range(dst_x[0] // bw, (dst_x[1] - 1) // bw + 1):
+                key = (bx, by)
+                x0, y0, x1, y1 = self._block_bounds(key)
+                if key not in self._blocks:
+                    buffer = np.empty((y1 - y0, x1 - x0) + tuple(self.output.shape[2:]), dtype=self.output.dtype)
+                    mask = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+                    self._blocks[key] = [buffer, mask, 0]
+                block = self._blocks[key]
+
+                # Intersection of the destination window and the block
+                ix0, ix1 = max(dst_x[0], x0), min(dst_x[1], x1)
+                iy0, iy1 = max(dst_y[0], y0), min(dst_y[1], y1)
+                block[0][iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0] = data[
+                    iy0 - dst_y[0]:iy1 - dst_y[0], ix0 - dst_x[0]:ix1 - dst_x[0]
+                ]
+                mask = block[1][iy0 - y0:iy1 - y0, ix0 - x0:ix1 - x0]
+                block[2] += mask.size - int(np.count_nonzero(mask))
+                mask[...] = True
+
+                if block[2] == block[1].size:
+                    self._flush_block(key)
+
+    def _flush_block(self, key):
+        buffer, mask, n_covered = self._blocks.pop(key)
+        x0, y0, x1, y1 = self._block_bounds(key)
+        if n_covered < mask.size:
+            # Partially covered block: keep unwritten pixels of the output
+            existing = np.array(self.output[y0:y1, x0:x1])
+            existing[mask] = buffer[mask]
+            buffer = existing
+        self.output[y0:y1, x0:x1] = buffer